@@ -1,8 +1,10 @@
+import hashlib
 import os
 from pathlib import Path
 from typing import List
 
 from dotenv import load_dotenv
+import tiktoken
 from unstructured.partition.pdf import partition_pdf
 from openai import OpenAI
 
@@ -59,8 +61,29 @@ for pdf_file in pdf_files:
 # Main Business Logic for PDF Extraction using Unstructured
 # ===========================================================
 
-all_elements = []
-all_pdf_texts = []
+USEFUL_CATEGORIES = frozenset({
+    "Title",
+    "NarrativeText",
+    "ListItem",
+    "Table",  # Include tables directly from PDF
+})
+
+# Token budget for the document (chars != tokens, so the limit is counted in model tokens)
+MODEL_CONTEXT_TOKENS = 120_000
+RESERVED_OUTPUT_TOKENS = 2048
+INPUT_TOKEN_BUDGET = MODEL_CONTEXT_TOKENS - RESERVED_OUTPUT_TOKENS
+TABLE_BUDGET_SHARE = 0.4  # tables may take up to 40% of the budget when both don't fit
+
+# Process-and-discard: only small per-PDF summaries are kept across files, so the
+# element objects of one PDF can be freed before the next one is parsed
+# (peak memory ~ the largest single PDF instead of all PDFs together).
+total_elements = 0
+element_samples = []   # (category, preview) of the first 10 elements overall
+all_categories = {}
+text_blocks: List[str] = []
+total_text_chars = 0
+pdf_breakdown = []     # (filename, number of text blocks, text chars) per PDF
+pdf_tables_count = 0
 
 for pdf_file in pdf_files:
     print(f"\n{'=' * 80}")
@@ -79,22 +102,36 @@ for pdf_file in pdf_files:
     )
     
     print(f"✅ Extracted {len(elements)} elements from {pdf_file.name}")
-    all_elements.extend(elements)
-    
-    # Store PDF-specific text for reference
-    all_pdf_texts.append({
-        "filename": pdf_file.name,
-        "elements": elements,
-        "count": len(elements)
-    })
-
-print(f"\n✅ Total elements extracted from all PDFs: {len(all_elements)}\n")
+    total_elements += len(elements)
+
+    for el in elements[: max(0, 10 - len(element_samples))]:
+        element_samples.append((el.category, (el.text or "").strip()[:200]))
+
+    # One pass per PDF: category histogram, useful text blocks and table count together
+    pdf_text_blocks = []
+    pdf_chars = 0
+    for el in elements:
+        cat = el.category
+        all_categories[cat] = all_categories.get(cat, 0) + 1
+        text = el.text
+        if cat in USEFUL_CATEGORIES and text:
+            block = text.strip()
+            pdf_text_blocks.append(block)
+            pdf_chars += len(block)
+            if cat == "Table":
+                pdf_tables_count += 1
+    text_blocks.extend(pdf_text_blocks)
+    total_text_chars += pdf_chars
+    pdf_breakdown.append((pdf_file.name, len(pdf_text_blocks), pdf_chars))
+
+    del elements
+
+print(f"\n✅ Total elements extracted from all PDFs: {total_elements}\n")
 
 # Show sample of elements from all PDFs
 print("Sample of extracted elements (from all PDFs):")
-for i, el in enumerate(all_elements[:10]):
-    text_preview = (el.text or "").strip()[:200]
-    print(f"[{i}] CATEGORY={el.category} | Text length: {len(text_preview)}")
+for i, (category, text_preview) in enumerate(element_samples):
+    print(f"[{i}] CATEGORY={category} | Text length: {len(text_preview)}")
     print(f"    Preview: {text_preview}")
     print("-" * 80)
 
@@ -119,62 +156,37 @@ else:
 # ============================================================
 # Build document text (NO CHUNKING)
 # ============================================================
-USEFUL_CATEGORIES = {
-    "Title",
-    "NarrativeText",
-    "ListItem",
-    "Table",  # Include tables directly from PDF
-}
-
-MAX_CONTEXT_CHARS = 12_000
 
 # Debug: Show all categories found across all PDFs
-all_categories = {}
-for el in all_elements:
-    cat = el.category
-    all_categories[cat] = all_categories.get(cat, 0) + 1
-
 print(f"\n📋 Categories found across all PDFs:")
 for cat, count in sorted(all_categories.items()):
     marker = "✅" if cat in USEFUL_CATEGORIES else "❌"
     print(f"   {marker} {cat}: {count} element(s)")
 
-# Extract text blocks from all PDFs
-text_blocks: List[str] = [
-    el.text.strip()
-    for el in all_elements
-    if el.category in USEFUL_CATEGORIES and el.text
-]
-
 print(f"\n📝 Extracted {len(text_blocks)} text block(s) from all PDFs")
-print(f"   Total PDF text length: {sum(len(block) for block in text_blocks)} characters")
+print(f"   Total PDF text length: {total_text_chars} characters")
 
 # Show breakdown by PDF
 print(f"\n📊 Breakdown by PDF:")
-for pdf_info in all_pdf_texts:
-    pdf_elements = pdf_info["elements"]
-    pdf_text_blocks = [
-        el.text.strip()
-        for el in pdf_elements
-        if el.category in USEFUL_CATEGORIES and el.text
-    ]
-    print(f"   {pdf_info['filename']}: {len(pdf_text_blocks)} text blocks, {sum(len(b) for b in pdf_text_blocks)} chars")
+for filename, n_blocks, n_chars in pdf_breakdown:
+    print(f"   {filename}: {n_blocks} text blocks, {n_chars} chars")
 
 # Count tables found across all PDFs
-pdf_tables = [el for el in all_elements if el.category == "Table" and el.text]
-print(f"📊 Found {len(pdf_tables)} table(s) directly in PDFs")
+print(f"📊 Found {pdf_tables_count} table(s) directly in PDFs")
 
-# Combine PDF text with table text
-DOCUMENT_TEXT = "\n\n".join(text_blocks)
-print(f"📄 PDF text combined: {len(DOCUMENT_TEXT)} characters")
+try:
+    _ENCODING = tiktoken.encoding_for_model("gpt-4o-mini")
+except KeyError:  # older tiktoken releases don't know the gpt-4o tokenizer
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+
+TABLE_SEPARATOR = "\n\n" + "=" * 80 + "\n" + "TABLES FROM DOCUMENT IMAGES:\n" + "=" * 80 + "\n"
+
+# Combine PDF text with table text (joined once, reused below)
+pdf_text_only = "\n\n".join(text_blocks)
+print(f"📄 PDF text combined: {len(pdf_text_only)} characters")
 
-# Add table content from images if available
 if TABLE_TEXT:
     print(f"✅ Adding table content from images ({len(TABLE_TEXT)} characters)")
-    DOCUMENT_TEXT += "\n\n" + "=" * 80 + "\n"
-    DOCUMENT_TEXT += "TABLES FROM DOCUMENT IMAGES:\n"
-    DOCUMENT_TEXT += "=" * 80 + "\n"
-    DOCUMENT_TEXT += TABLE_TEXT
 else:
     print(f"⚠️  No table content extracted from images")
 
@@ -182,7 +194,6 @@ else:
 print(f"\n📄 Document text preview:")
 print("-" * 80)
 print(f"First 500 chars of combined PDF text:")
-pdf_text_only = "\n\n".join(text_blocks)
 print(pdf_text_only[:500])
 print("..." if len(pdf_text_only) > 500 else "")
 print("-" * 80)
@@ -192,46 +203,38 @@ if TABLE_TEXT:
     print("..." if len(TABLE_TEXT) > 300 else "")
     print("-" * 80)
 
-# Truncate if too long (prioritize PDF text, then add tables)
-if len(DOCUMENT_TEXT) > MAX_CONTEXT_CHARS:
-    print(f"\n⚠️  Combined document text ({len(DOCUMENT_TEXT)} chars) exceeds limit ({MAX_CONTEXT_CHARS} chars)")
-    
-    pdf_text_only = "\n\n".join(text_blocks)
-    pdf_text_len = len(pdf_text_only)
-    table_text_len = len(TABLE_TEXT) if TABLE_TEXT else 0
-    separator_len = len("\n\n" + "=" * 80 + "\nTABLES FROM DOCUMENT IMAGES:\n" + "=" * 80 + "\n")
-    
-    # Strategy: Keep as much PDF text as possible, then add tables
-    if table_text_len > 0:
-        available_for_pdf = MAX_CONTEXT_CHARS - table_text_len - separator_len
-        if available_for_pdf > 1000:  # Ensure we keep substantial PDF text
-            # Truncate PDF text, keep all table text
-            truncated_pdf = pdf_text_only[:available_for_pdf]
-            DOCUMENT_TEXT = truncated_pdf + "\n\n" + "=" * 80 + "\n" + "TABLES FROM DOCUMENT IMAGES:\n" + "=" * 80 + "\n" + TABLE_TEXT
-            print(f"   📄 PDF text: {len(truncated_pdf)} chars (truncated from {pdf_text_len})")
-            print(f"   📊 Table text: {table_text_len} chars (preserved)")
-        else:
-            # PDF text is too large, prioritize it over tables
-            DOCUMENT_TEXT = pdf_text_only[:MAX_CONTEXT_CHARS]
-            print(f"   ⚠️  Combined PDF text too large, keeping only PDF text ({MAX_CONTEXT_CHARS} chars)")
-            print(f"   ⚠️  Table text ({table_text_len} chars) excluded due to size limit")
-    else:
-        # No table text, just truncate PDF
-        DOCUMENT_TEXT = pdf_text_only[:MAX_CONTEXT_CHARS]
-        print(f"   📄 Combined PDF text truncated to {MAX_CONTEXT_CHARS} characters")
-    
-    print(f"   ✅ Final document: {len(DOCUMENT_TEXT)} characters")
+# Tokenize each part once; truncation slices token lists, so cuts never fall mid-token
+pdf_tokens = _ENCODING.encode(pdf_text_only)
+table_tokens = _ENCODING.encode(TABLE_TEXT) if TABLE_TEXT else []
+separator_tokens = len(_ENCODING.encode(TABLE_SEPARATOR)) if TABLE_TEXT else 0
+total_tokens = len(pdf_tokens) + separator_tokens + len(table_tokens)
+
+pdf_part = pdf_text_only
+table_part = TABLE_TEXT
+if total_tokens > INPUT_TOKEN_BUDGET:
+    print(f"\n⚠️  Combined document ({total_tokens} tokens) exceeds budget ({INPUT_TOKEN_BUDGET} tokens)")
+    available = INPUT_TOKEN_BUDGET - separator_tokens
+    # Tables get their share (or whatever the PDF text leaves over); PDF text gets the rest
+    table_budget = min(len(table_tokens), max(int(TABLE_BUDGET_SHARE * available), available - len(pdf_tokens)))
+    pdf_budget = available - table_budget
+    if len(pdf_tokens) > pdf_budget:
+        pdf_part = _ENCODING.decode(pdf_tokens[:pdf_budget])
+    if len(table_tokens) > table_budget:
+        table_part = _ENCODING.decode(table_tokens[:table_budget])
+    print(f"   📄 PDF text: {min(len(pdf_tokens), pdf_budget)} of {len(pdf_tokens)} tokens")
+    if TABLE_TEXT:
+        print(f"   📊 Table text: {table_budget} of {len(table_tokens)} tokens")
+
+DOCUMENT_TEXT = pdf_part + TABLE_SEPARATOR + table_part if table_part else pdf_part
 
 print(f"\n📄 Final document text loaded ({len(DOCUMENT_TEXT)} characters)")
-pdf_text_in_final = "\n\n".join(text_blocks)
-if TABLE_TEXT:
-    pdf_text_in_final_len = len(DOCUMENT_TEXT.split("TABLES FROM DOCUMENT IMAGES")[0]) if "TABLES FROM DOCUMENT IMAGES" in DOCUMENT_TEXT else len(DOCUMENT_TEXT)
-    print(f"   📝 Combined PDF text in final document: {pdf_text_in_final_len} characters")
+if table_part:
+    print(f"   📝 Combined PDF text in final document: {len(pdf_part)} characters")
     print(f"   📊 Table content from images: {len(TABLE_TEXT)} characters")
 else:
     print(f"   📝 Combined PDF text: {len(DOCUMENT_TEXT)} characters")
-if pdf_tables:
-    print(f"   📊 Includes {len(pdf_tables)} table(s) directly from PDFs")
+if pdf_tables_count:
+    print(f"   📊 Includes {pdf_tables_count} table(s) directly from PDFs")
 print(f"   📚 Processed {len(pdf_files)} PDF file(s)")
 print()
 
@@ -239,9 +242,12 @@ print()
 # ============================================================
 # GPT Question Answering
 # ============================================================
-def ask_gpt(question: str, debug: bool = False) -> str:
-    prompt = f"""
-You are answering questions about a document.
+# DOCUMENT_TEXT is fixed for the whole session, so the rules + document go in one system message
+# built once here. Every request then starts with the same prefix - the rules plus the whole
+# document, up to INPUT_TOKEN_BUDGET (MODEL_CONTEXT_TOKENS - RESERVED_OUTPUT_TOKENS) tokens, tables
+# capped at TABLE_BUDGET_SHARE of it when trimmed - which OpenAI's automatic prompt caching reuses
+# instead of re-processing; only the question changes per call.
+_SYSTEM_PROMPT = f"""You are a precise document analysis assistant answering questions about a document.
 
 RULES:
 - Use ONLY the document text below
@@ -251,30 +257,41 @@ RULES:
 
 DOCUMENT:
 {DOCUMENT_TEXT}
-
-QUESTION:
-{question}
 """
+_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}  # reused as-is by every request
+# Same key for the same document -> requests are routed to the same prompt cache
+_PROMPT_CACHE_KEY = hashlib.sha1(DOCUMENT_TEXT.encode("utf-8")).hexdigest()
 
+# Debug facts about DOCUMENT_TEXT, computed once (it never changes) instead of rescanning per question
+_DOC_HAS_TABLE_ANY_CASE = "TABLE" in DOCUMENT_TEXT.upper()
+_DOC_HAS_TABLE_TITLE_CASE = "Table" in DOCUMENT_TEXT
+_TABLE_MARKER = "TABLES FROM DOCUMENT"
+_TABLE_SECTION_OFFSET = DOCUMENT_TEXT.find(_TABLE_MARKER)
+if _TABLE_SECTION_OFFSET != -1:
+    _TABLE_SECTION_OFFSET += len(_TABLE_MARKER)  # preview starts right after the marker, as before
+
+
+def ask_gpt(question: str, debug: bool = False) -> str:
     if debug:
         print("\n" + "=" * 80)
         print("DEBUG: Document text being sent to GPT:")
         print("=" * 80)
         print(f"Length: {len(DOCUMENT_TEXT)} characters")
-        print(f"Contains 'TABLE': {'TABLE' in DOCUMENT_TEXT.upper()}")
-        print(f"Contains 'Table': {'Table' in DOCUMENT_TEXT}")
-        if "TABLES FROM DOCUMENT" in DOCUMENT_TEXT:
-            table_section = DOCUMENT_TEXT.split("TABLES FROM DOCUMENT")[1][:500]
+        print(f"Contains 'TABLE': {_DOC_HAS_TABLE_ANY_CASE}")
+        print(f"Contains 'Table': {_DOC_HAS_TABLE_TITLE_CASE}")
+        if _TABLE_SECTION_OFFSET != -1:
+            table_section = DOCUMENT_TEXT[_TABLE_SECTION_OFFSET : _TABLE_SECTION_OFFSET + 500]
             print(f"\nTable section preview:\n{table_section}...")
         print("=" * 80 + "\n")
 
     response = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
-            {"role": "system", "content": "You are a precise document analysis assistant."},
-            {"role": "user", "content": prompt},
+            _SYSTEM_MESSAGE,
+            {"role": "user", "content": question},
         ],
         temperature=0.0,
+        extra_body={"prompt_cache_key": _PROMPT_CACHE_KEY},
     )
 
     return response.choices[0].message.content.strip()
@@ -6,32 +6,38 @@ This is the CLI entrypoint to build or rebuild the RAG index using Terminal comm
 The rebuild command is the CLI entrypoint: you can run it from the terminal to 
 rebuild the vector index with custom options. For example:
 
-python scripts/rebuild_index.py rebuild \
+python -m scripts.index_cli rebuild \
   --data-dir src/business/rag/data \
   --persist-dir src/business/rag/vectorstore \
   --max-context-chars 12000 \
   --chunk-size 800 \
   --overlap 100 \
-  --include-table-images true
+  --include-table-images true \
+  --num-workers 4
 
+Run it from the project root with `python -m` so `src` is importable without touching sys.path.
 This ingests your PDFs, chunks them, embeds them, and saves the index to the specified persist_dir.
 """
-import sys
+import os
 from pathlib import Path
 
 import typer
 
-# Ensure project root on sys.path when running directly
-ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 from src.business.rag.index_builder import build_index
 
+app = typer.Typer(help="RAG index maintenance commands.")
+
+
+@app.callback()
+def main():
+    """RAG index maintenance commands."""
+
+
 # persist_dir is where the Chroma vector DB is persisted.
 # build_index() writes chunk IDs, embeddings, documents, and metadata there.
 # Default: src/business/rag/vectorstore (configurable via CLI).
 
+@app.command()
 def rebuild(
     data_dir: Path = typer.Option("src/business/rag/data", help="Directory with PDFs"),
     persist_dir: Path = typer.Option("src/business/rag/vectorstore", help="Chroma persistence directory"),
@@ -39,6 +45,7 @@ def rebuild(
     include_table_images: bool = typer.Option(True, help="Process table images via Unstructured API if configured"),
     chunk_size: int = typer.Option(800, help="Chunk size (characters)"),
     overlap: int = typer.Option(100, help="Chunk overlap (characters)"),
+    num_workers: int = typer.Option(min(os.cpu_count() or 1, 4), help="Processes used to parse PDFs in parallel"),
 ):
     docs, chunks = build_index(
         data_dir=data_dir,
@@ -47,9 +54,10 @@ def rebuild(
         include_table_images=include_table_images,
         chunk_size=chunk_size,
         overlap=overlap,
+        num_workers=num_workers,
     )
     typer.echo(f"Indexed {docs} document(s), {chunks} chunk(s) → {persist_dir}")
 
 
 if __name__ == "__main__":
-    typer.run(rebuild)
+    app()
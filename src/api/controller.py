@@ -1,45 +1,70 @@
 from fastapi import HTTPException, status
-from typing import Optional
-from src.data.dto import (
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional, Union
+from cachetools import TTLCache
+import orjson
+from src.database.dto import (
     ChatMessageRequest,
     ChatMessageResponse,
     ChatHistoryRequest,
     ChatHistoryResponse
 )
-from src.business.chatbot import process_chat_message
+from src.business.chatbot.chatbot import process_chat_message, stream_chat_message
+
+# Short-lived cache for GET /history - polling frontends repeat the same query every few seconds.
+# Bounded size + TTL keeps memory flat and staleness to a few seconds.
+_history_cache: TTLCache = TTLCache(maxsize=10_000, ttl=5)
+
+
+async def _to_sse(first: Optional[str], tokens: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """
+    Wrap each streamed piece as a server-sent event (JSON-encoded so newlines are safe).
+
+    The 200 status is already sent once streaming starts, so a failure mid-stream is
+    reported as an "error" event instead of silently cutting the connection.
+    """
+    try:
+        if first is not None:
+            yield b"data: " + orjson.dumps(first) + b"\n\n"
+        async for token in tokens:
+            yield b"data: " + orjson.dumps(token) + b"\n\n"
+    except Exception as e:
+        yield b"event: error\ndata: " + orjson.dumps(f"Internal server error: {str(e)}") + b"\n\n"
+        return
+    yield b"data: [DONE]\n\n"
 
 
 class ChatController:
     @staticmethod
-    async def send_message(request: ChatMessageRequest) -> ChatMessageResponse:
+    async def send_message(request: ChatMessageRequest) -> Union[ChatMessageResponse, StreamingResponse]:
         try:
-            # Step 1: Validate additional business rules (if needed)
-            # DTO already validates structure, but you can add domain validation here
-            if not request.message or not request.message.strip():
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Message cannot be empty"
-                )
+            # Step 1: Validation
+            # The DTO already rejects empty messages (422) before this runs;
+            # add any extra domain validation here
             
+            # Streaming requests get the reply as server-sent events instead of one JSON body
+            if request.stream:
+                tokens = await stream_chat_message(request)
+                # Pull the first piece before responding: retrieval and the LLM call start here,
+                # so their failures still map to 400/500 below instead of breaking the stream
+                first = await anext(tokens, None)
+                return StreamingResponse(
+                    _to_sse(first, tokens),
+                    media_type="text/event-stream",
+                )
+
             # Step 2: Call business logic
             # This is where the actual chatbot processing happens
             result = await process_chat_message(request)
             
             # Step 3: Convert business logic result to response DTO
-            # The business logic returns a dict, we convert it to ChatMessageResponse
-            if isinstance(result, dict):
-                # Extract reply from result
-                reply = result.get("reply", "I'm sorry, I couldn't process that.")
-                
-                return ChatMessageResponse(
-                    reply=reply,
-                    session_id=request.session_id,
-                    model_used=result.get("model_used", "zephyr-7b-beta"),
-                    tokens_used=result.get("tokens_used")
-                )
-            else:
-                # If business logic already returns ChatMessageResponse
+            if isinstance(result, ChatMessageResponse):
+                # Business logic already returned the response DTO
                 return result
+
+            # The business logic returns a dict; Pydantic converts it in one call and
+            # fills defaults (reply, model_used) for any missing keys
+            return ChatMessageResponse.model_validate({**result, "session_id": request.session_id})
                 
         except ValueError as e:
             # Handle validation errors from business logic
@@ -75,6 +100,11 @@ class ChatController:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid user_id"
                 )
+
+            cache_key = (request.user_id, request.session_id, request.limit, request.offset)
+            cached = _history_cache.get(cache_key)
+            if cached is not None:
+                return cached
             
             # Step 2: Call business logic to fetch history from database
             # TODO: Implement get_chat_history() in business/chatbot.py
@@ -96,11 +126,13 @@ class ChatController:
             total = 0
             
             # Step 3: Return response
-            return ChatHistoryResponse(
+            response = ChatHistoryResponse(
                 messages=messages,
                 total=total,
                 session_id=request.session_id
             )
+            _history_cache[cache_key] = response
+            return response
             
         except HTTPException:
             # Re-raise HTTP exceptions (already formatted)
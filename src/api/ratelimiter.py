@@ -1,4 +1,5 @@
 # this is the token bucket rate limiter implementation
+import threading
 import time
 
 """
@@ -35,10 +36,10 @@ VARIABLES EXPLAINED:
    - Increases when refilled (up to capacity)
    - Like the current water level in the bucket
 
-4. last_refill_timestamp (float)
-   - Unix timestamp (seconds since epoch) of the last refill
+4. last_refill_timestamp (int)
+   - Monotonic clock reading (nanoseconds, time.monotonic_ns()) of the last refill
    - Used to calculate how much time has passed
-   - Example: 1704067200.0 (January 1, 2024, 00:00:00 UTC)
+   - Monotonic means it never jumps backwards when the system clock is adjusted
    - Updated every time _refill() is called
    - Like a stopwatch to track time between refills
 
@@ -54,6 +55,11 @@ VARIABLES EXPLAINED:
    - Example: elapsed=2.5, refill_rate=2.0 → added_tokens = 5.0
    - Can't exceed capacity (capped by min() function)
 
+IMPLEMENTATION NOTE:
+   Internally tokens are kept as integers scaled by 10**9 (_tokens_scaled) and time
+   is read in integer nanoseconds, so _refill() is pure integer arithmetic.
+   The example below uses plain seconds and tokens for readability.
+
 EXAMPLE SCENARIO:
 
 Initialization:
@@ -103,7 +109,21 @@ User immediately tries to consume 5 tokens:
     Return False (request denied - rate limited!)
 """
 
+_SCALE = 10**9  # fixed-point scale for token counts (1 token == 10**9 units)
+
+
 class TokenBucket:
+    # No per-instance __dict__: buckets are created per user/IP, so this keeps each one small
+    __slots__ = (
+        "capacity",
+        "refill_rate",
+        "last_refill_timestamp",
+        "_tokens_scaled",
+        "_cap_scaled",
+        "_rate_scaled",
+        "_lock",
+    )
+
     def __init__(self, capacity: int, refill_rate: float):
         """
         Initialize the TokenBucket.
@@ -115,8 +135,13 @@ class TokenBucket:
         """
         self.capacity = capacity  # Max tokens bucket can hold
         self.refill_rate = refill_rate  # Tokens added per second
-        self.tokens = capacity  # Current tokens (starts full)
-        self.last_refill_timestamp = time.time()  # Last refill time
+        self._cap_scaled = capacity * _SCALE  # Capacity in fixed-point units
+        self._rate_scaled = int(refill_rate * _SCALE)  # Fixed-point units added per second
+        self._tokens_scaled = self._cap_scaled  # Current tokens (starts full)
+        self.last_refill_timestamp = time.monotonic_ns()  # Last refill time
+        # Refill + deduct is a read-modify-write; the lock stops two concurrent
+        # requests from both passing the check and over-spending tokens
+        self._lock = threading.Lock()
 
     def _refill(self):
         """
@@ -128,12 +153,17 @@ class TokenBucket:
         3. Add tokens (capped at capacity)
         4. Update last_refill_timestamp
         """
-        now = time.time()  # Current time in seconds
-        elapsed = now - self.last_refill_timestamp  # Time passed since last refill
-        added_tokens = elapsed * self.refill_rate  # Tokens to add based on time
-        self.tokens = min(self.capacity, self.tokens + added_tokens)  # Add tokens (max = capacity)
+        now = time.monotonic_ns()  # Current time in nanoseconds
+        elapsed_ns = now - self.last_refill_timestamp  # Time passed since last refill
+        added = elapsed_ns * self._rate_scaled // _SCALE  # Tokens to add based on time
+        self._tokens_scaled = min(self._cap_scaled, self._tokens_scaled + added)  # Add tokens (max = capacity)
         self.last_refill_timestamp = now  # Update timestamp for next calculation
 
+    @property
+    def tokens(self) -> float:
+        """Current number of tokens in the bucket."""
+        return self._tokens_scaled / _SCALE
+
     def consume(self, tokens: int) -> bool:
         """
         Attempt to consume a specified number of tokens from the bucket.
@@ -147,8 +177,10 @@ class TokenBucket:
         3. If yes, consume tokens and return True
         4. If no, return False (rate limit exceeded)
         """
-        self._refill()  # Refill before checking
-        if self.tokens >= tokens:
-            self.tokens -= tokens  # Consume tokens
-            return True  # Request allowed
-        return False  # Request denied (rate limited)
\ No newline at end of file
+        with self._lock:
+            self._refill()  # Refill before checking
+            needed = tokens * _SCALE
+            if self._tokens_scaled >= needed:
+                self._tokens_scaled -= needed  # Consume tokens
+                return True  # Request allowed
+            return False  # Request denied (rate limited)
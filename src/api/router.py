@@ -9,8 +9,11 @@ In Clean Architecture:
 The router is thin - it just defines routes and delegates to controllers.
 """
 
-from fastapi import APIRouter
-from src.data.dto import (
+import hashlib
+
+import orjson
+from fastapi import APIRouter, Depends, Request, Response
+from src.database.dto import (
     ChatMessageRequest,
     ChatMessageResponse,
     ChatHistoryRequest,
@@ -43,31 +46,28 @@ async def chat_endpoint(request: ChatMessageRequest):
 
 
 @router.get("/history", response_model=ChatHistoryResponse)
-async def chat_history_endpoint(
-    user_id: int,
-    session_id: str = None,
-    limit: int = 50,
-    offset: int = 0
-):
+async def chat_history_endpoint(http_request: Request, request: ChatHistoryRequest = Depends()):
     """
     Retrieve chat history for a user.
     
     Flow:
-    1. FastAPI extracts query parameters
-    2. Router creates ChatHistoryRequest DTO
-    3. Router delegates to controller
-    4. Returns ChatHistoryResponse
+    1. FastAPI reads query parameters (user_id, session_id, limit, offset)
+       straight into the ChatHistoryRequest DTO via Depends()
+    2. Router delegates to controller
+    3. Returns ChatHistoryResponse with an ETag header
+
+    If the client sends If-None-Match with the current ETag, a bodyless
+    304 Not Modified is returned instead of the full history.
     """
-    # Convert query params to DTO
-    request = ChatHistoryRequest(
-        user_id=user_id,
-        session_id=session_id,
-        limit=limit,
-        offset=offset
-    )
-    
     # Delegate to controller
-    return await chat_controller.get_chat_history(request)
+    history = await chat_controller.get_chat_history(request)
+
+    # orjson serializes datetime/UUID values natively, so skip the Python-level mode="json" conversion
+    body = orjson.dumps(history.model_dump())
+    etag = f'"{hashlib.blake2s(body).hexdigest()}"'
+    if http_request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 # Example showing the difference:
@@ -11,10 +11,25 @@ The user's understanding is CORRECT for auto-detection approach:
 
 from src.database.dto import ChatMessageRequest, StructuredQueryRequest, FreeFormQueryRequest
 from src.business.rag.retrieval import RAGPipeline
+from starlette.concurrency import iterate_in_threadpool
 from pathlib import Path
+from functools import lru_cache
+from typing import AsyncIterator
+import asyncio
+import json
 import os
+import re
 
+# Command phrases, precompiled once at import. Each is a whole-word match ("create tasks" yes,
+# "create a taskforce" / "recreate task list" no), and the same pattern is used by
+# detect_query_type() and parse_to_structured(), so a detected command always parses.
+CREATE_TASK_RE = re.compile(r"\bcreate (?:a )?tasks?\b", re.IGNORECASE)
+LIST_TASKS_RE = re.compile(r"\blist tasks\b", re.IGNORECASE)
+DELETE_TASK_RE = re.compile(r"\bdelete tasks?\b", re.IGNORECASE)
+ACTION_PATTERNS = (CREATE_TASK_RE, LIST_TASKS_RE, DELETE_TASK_RE)
 
+
+@lru_cache(maxsize=1024)
 def detect_query_type(message: str) -> str:
     """
     Detects if user input is command-style or natural language.
@@ -25,16 +40,10 @@ def detect_query_type(message: str) -> str:
     - Rule-based parsing
     - Or a combination
     """
-    message_lower = message.lower().strip()
-    
     # Simple rule-based detection (in production, use LLM)
-    command_keywords = ["create", "delete", "update", "list", "show", "get"]
-    action_patterns = ["create task", "list tasks", "delete task"]
-    
     # Check if it looks like a command
-    if any(keyword in message_lower for keyword in command_keywords):
-        if any(pattern in message_lower for pattern in action_patterns):
-            return "structured"  # Command-style
+    if any(pattern.search(message) for pattern in ACTION_PATTERNS):
+        return "structured"  # Command-style
     
     return "freeform"  # Natural language conversation
 
@@ -57,9 +66,7 @@ def parse_to_structured(message: str) -> StructuredQueryRequest:
     # In production, use LLM with function calling or structured output
     # This is a simplified example
     
-    message_lower = message.lower()
-    
-    if "create task" in message_lower or "create a task" in message_lower:
+    if CREATE_TASK_RE.search(message):
         # Extract task details (simplified - use LLM in production)
         return StructuredQueryRequest(
             query_type="structured",
@@ -116,14 +123,54 @@ async def handle_structured_query(request: StructuredQueryRequest):
     return {"status": "processed", "action": request.action}
 
 
+@lru_cache(maxsize=4)
+def _get_rag(persist_dir: str) -> RAGPipeline:
+    """
+    Build the RAG pipeline once per vector store and reuse it across requests.
+    Construction is synchronous (no await), so the event loop cannot interleave two inits.
+    """
+    return RAGPipeline(persist_dir=persist_dir)
+
+
+def get_rag_pipeline() -> RAGPipeline:
+    """Return the shared RAG pipeline for VECTOR_STORE_DIR (built on first use or at app startup)."""
+    persist_dir = Path(os.getenv("VECTOR_STORE_DIR", "src/business/rag/vectorstore"))
+    return _get_rag(str(persist_dir))
+
+
 async def handle_freeform_query(request: FreeFormQueryRequest):
     """Handle free-form natural language conversation via RAG."""
-    persist_dir = Path(os.getenv("VECTOR_STORE_DIR", "src/business/rag/vectorstore"))
-    rag = RAGPipeline(persist_dir=str(persist_dir))
-    answer, confidence, _ = rag.answer(request.message)
+    rag = get_rag_pipeline()
+    # rag.answer() blocks on Chroma and OpenAI I/O - run it in a worker thread
+    # so this event loop keeps serving other requests meanwhile
+    answer, confidence, _ = await asyncio.to_thread(rag.answer, request.message)
     return {"reply": answer, "type": "freeform", "confidence": confidence}
 
 
+async def _yield_once(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def stream_chat_message(request: ChatMessageRequest) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of process_chat_message(); returns the iterator of reply pieces.
+
+    Detection, parsing and structured commands run here, before the caller starts the
+    response, so their errors (e.g. ValueError for an unparsable command) still reach it.
+    Free-form replies are yielded piece by piece as the LLM produces them.
+    Structured commands have nothing to stream, so their result is yielded once as JSON.
+    """
+    message = request.message
+
+    if detect_query_type(message) == "structured":
+        result = await handle_structured_query(parse_to_structured(message))
+        return _yield_once(json.dumps(result))
+
+    rag = get_rag_pipeline()
+    # answer_stream() is a blocking generator (sync OpenAI client) - iterate it off the event loop
+    return iterate_in_threadpool(rag.answer_stream(message))
+
+
 # Example usage flow:
 """
 1. User sends: "Create a task to buy groceries tomorrow"
@@ -2,10 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-from openai import OpenAI
+import numpy as np
+
+from .openai_client import shared_openai_client
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "chatbot"
 
 
 class Embedder(ABC):
@@ -23,25 +34,279 @@ class Embedder(ABC):
         """
         return self.embed_query(text)
 
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        embed_query() for async callers. Goes through this embedder's shared AsyncBatchedEmbedder:
+        concurrent calls are merged into one embed_documents() call, run in a worker thread
+        so the event loop keeps serving.
+        """
+        batcher = getattr(self, "_async_batcher", None)
+        if batcher is None:
+            batcher = self._async_batcher = AsyncBatchedEmbedder(self)
+        return await batcher.embed(text)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed on-disk cache of embeddings (SQLite).
+    Keys are sha256(model + "\0" + text); values are packed float32 blobs with their dim.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (digest TEXT PRIMARY KEY, dim INTEGER, vec BLOB)"
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, digests: List[str]) -> Dict[str, np.ndarray]:
+        if not digests:
+            return {}
+        hits: Dict[str, np.ndarray] = {}
+        with self._lock:
+            # SQLite limits bound parameters per statement, so look up in slices
+            for i in range(0, len(digests), 500):
+                part = digests[i : i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT digest, dim, vec FROM embeddings WHERE digest IN ({placeholders})", part
+                ).fetchall()
+                for digest, dim, blob in rows:
+                    vec = np.frombuffer(blob, dtype=np.float32)
+                    if vec.shape[0] == dim:  # skip truncated/corrupt entries
+                        hits[digest] = vec
+        return hits
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        rows = [
+            (digest, len(vec), np.asarray(vec, dtype=np.float32).tobytes())
+            for digest, vec in items.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (digest, dim, vec) VALUES (?, ?, ?)", rows
+            )
+
 
 class OpenAIEmbedder(Embedder):
     """
     Thin wrapper over OpenAI embeddings.
     Uses text-embedding-3-small by default (fast, 1536 dims).
+    Embeddings are cached on disk so repeated queries and index rebuilds
+    only call the API for texts that have not been seen before.
     """
 
-    def __init__(self, api_key: str, model: str = "text-embedding-3-small"):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "text-embedding-3-small",
+        cache_dir: Path | None = DEFAULT_CACHE_DIR,
+    ):
+        self.client = shared_openai_client(api_key)
         self.model = model
+        # cache_dir=None disables the on-disk cache
+        self.cache = EmbeddingCache(Path(cache_dir) / f"embeddings-{model}.db") if cache_dir else None
 
-    def _embed(self, inputs: List[str]) -> List[List[float]]:
-        res = self.client.embeddings.create(model=self.model, input=inputs)
-        return [item.embedding for item in res.data]
+    @staticmethod
+    def _pack_batches(inputs: List[str], max_chars: int, max_items: int) -> List[List[str]]:
+        """
+        Greedily pack inputs into sub-batches bounded by total characters and item count.
+        Order is preserved, so flattening the batches gives back the original inputs.
+        """
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_chars = 0
+        for text in inputs:
+            if current and (current_chars + len(text) > max_chars or len(current) >= max_items):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(text)
+            current_chars += len(text)
+        if current:
+            batches.append(current)
+        return batches
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    def _embed_batch(self, batch: List[str]) -> np.ndarray:
+        res = self.client.embeddings.create(model=self.model, input=batch)
+        dim = len(res.data[0].embedding)
+        # Pack straight into a contiguous (N, D) float32 block instead of N lists of boxed floats
+        return np.fromiter(
+            (x for item in res.data for x in item.embedding),
+            dtype=np.float32,
+            count=len(res.data) * dim,
+        ).reshape(len(res.data), dim)
+
+    def _embed(
+        self,
+        inputs: List[str],
+        max_chars: int = 150_000,
+        max_items: int = 96,
+        max_parallel: int = 8,
+    ) -> np.ndarray:
+        """
+        Embed inputs in size-bounded sub-batches, sending batches concurrently.
+        The OpenAI client is thread-safe; executor.map keeps results in input order.
+        Returns an L2-normalized float32 array of shape (len(inputs), dim).
+        """
+        batches = self._pack_batches(inputs, max_chars=max_chars, max_items=max_items)
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+        if len(batches) == 1:
+            return self._normalize(self._embed_batch(batches[0]))
+
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(batches))) as executor:
+            return self._normalize(np.concatenate(list(executor.map(self._embed_batch, batches))))
+
+    @staticmethod
+    def _normalize(arr: np.ndarray) -> np.ndarray:
+        """
+        L2-normalize rows in place so a plain dot product equals cosine similarity.
+        """
+        norms = np.linalg.norm(arr, axis=1, keepdims=True)
+        np.divide(arr, norms, out=arr, where=norms > 0)
+        return arr
+
+    def _embed_cached(self, texts: List[str], **batching) -> np.ndarray:
+        """
+        Serve cache hits from disk and only send misses to the API.
+        batching: optional max_chars / max_items / max_parallel overrides for _embed().
+        """
+        if self.cache is None:
+            return self._embed(texts, **batching)
+
+        digests = [EmbeddingCache.digest(self.model, t) for t in texts]
+        hits = self.cache.get_many(list(set(digests)))
+
+        missing: Dict[str, str] = {}
+        for digest, text in zip(digests, texts):
+            if digest not in hits:
+                missing.setdefault(digest, text)
+
+        if missing:
+            fresh = dict(zip(missing.keys(), self._embed(list(missing.values()), **batching)))
+            self.cache.put_many(fresh)
+            hits.update(fresh)
+
+        return np.stack([hits[d] for d in digests])
+
+    def embed_documents_np(
+        self,
+        texts: List[str],
+        batch_size: int = 96,
+        max_chars: int = 150_000,
+        concurrency: int = 8,
+    ) -> np.ndarray:
+        """
+        Embed documents as a float32 array of shape (N, D).
+        Texts are sent in requests of at most batch_size items / max_chars characters,
+        with up to `concurrency` requests in flight.
+        """
         if not texts:
-            return []
-        return self._embed(texts)
+            return np.empty((0, 0), dtype=np.float32)
+        return self._embed_cached(texts, max_chars=max_chars, max_items=batch_size, max_parallel=concurrency)
+
+    def embed_query_np(self, text: str) -> np.ndarray:
+        """
+        Embed a single query as a float32 vector of shape (D,).
+        """
+        return self._embed_cached([text])[0]
+
+    # List-returning variants kept for callers that expect plain Python floats
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_documents_np(texts).tolist()
 
     def embed_query(self, text: str) -> List[float]:
-        return self._embed([text])[0]
+        return self.embed_query_np(text).tolist()
+
+    # Bind the alias directly instead of inheriting Embedder.embed's extra call frame
+    embed = embed_query
+
+
+def make_embedder(api_key: str | None = None) -> Embedder:
+    """
+    Embedder chosen by the EMBEDDER environment variable: "openai" (default, needs api_key)
+    or "local" (LocalHFEmbedder; model from LOCAL_EMBEDDING_MODEL, embeddings stay on this machine).
+    The index builder and RAGPipeline both use this, so an index is always queried with
+    the same kind of embedding it was built with.
+    """
+    kind = os.getenv("EMBEDDER", "openai").lower()
+    if kind == "local":
+        from .hf_embedding import LocalHFEmbedder  # torch/transformers only needed for this backend
+
+        model_name = os.getenv("LOCAL_EMBEDDING_MODEL")
+        return LocalHFEmbedder(model_name) if model_name else LocalHFEmbedder()
+    if kind != "openai":
+        raise ValueError(f"Unknown EMBEDDER {kind!r}; expected 'openai' or 'local'")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY missing in environment")
+    return OpenAIEmbedder(api_key=api_key)
+
+
+class AsyncBatchedEmbedder:
+    """
+    Dynamic batcher in front of an Embedder for async callers.
+
+    Concurrent embed() calls that arrive within max_wait seconds of each other are merged
+    into one embed_documents() call (one forward pass / one API request for up to max_batch
+    texts) instead of one call per text. Each caller gets its own vector back.
+    """
+
+    def __init__(self, embedder: Embedder, max_batch: int = 32, max_wait: float = 0.02):
+        self.embedder = embedder
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_full: Optional[asyncio.Event] = None  # set once max_batch requests are waiting
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            # Queue and worker belong to the running event loop, so create them on first use
+            self._queue = asyncio.Queue()
+            self._batch_full = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+            self._loop = loop
+        future: asyncio.Future = loop.create_future()
+        await self._queue.put((text, future))
+        if self._queue.qsize() >= self.max_batch - 1:  # + the one the worker already took
+            self._batch_full.set()
+        return await future
+
+    async def _next_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for one request, then up to max_wait for more (unless max_batch are queued), then drain."""
+        batch = [await self._queue.get()]
+        self._batch_full.clear()
+        if 1 + self._queue.qsize() < self.max_batch:
+            try:
+                # Time out on an Event, never on queue.get(): before Python 3.12 a timeout racing
+                # get() could drop the dequeued request, leaving its caller waiting forever
+                await asyncio.wait_for(self._batch_full.wait(), self.max_wait)
+            except asyncio.TimeoutError:
+                pass
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                # The embedder call blocks (model forward / HTTP), so keep it off the event loop
+                vectors = await asyncio.to_thread(self.embedder.embed_documents, [text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():  # the caller may have been cancelled meanwhile
+                    future.set_result(vector)
@@ -0,0 +1,170 @@
+"""Local Hugging Face embedding model (on-prem / offline, no API calls)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from transformers import AutoModel, AutoTokenizer
+
+from .embedding import DEFAULT_CACHE_DIR, Embedder
+
+# Optional: ONNX Runtime backend (fused attention/GELU kernels, no eager PyTorch overhead per call)
+try:
+    import onnxruntime as ort
+    _ORT_AVAILABLE = True
+except ImportError:
+    _ORT_AVAILABLE = False
+
+ONNX_CACHE_DIR = DEFAULT_CACHE_DIR / "onnx"
+
+
+class LocalHFEmbedder(Embedder):
+    """
+    Sentence embeddings from a local transformer: mean pooling over tokens + L2 normalization
+    (same output as sentence-transformers models such as all-MiniLM-L6-v2).
+    Suitable for LongTermMemory when embeddings should not leave the machine.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        device: str | None = None,
+        batch_size: int = 64,
+        max_length: int = 512,
+        use_onnx: bool = False,
+        compile_model: bool = True,
+    ):
+        """
+        use_onnx: run the model with ONNX Runtime (needs onnxruntime). The model is exported once
+        to ~/.cache/chatbot/onnx and the session is reused; inputs/outputs stay NumPy arrays.
+        compile_model: torch.compile the model on GPU (ignored on CPU and with use_onnx).
+        """
+        self.device = torch.device(device or ("cuda" if torch.cuda.is_available() else "cpu"))
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.use_onnx = use_onnx
+        if use_onnx and not _ORT_AVAILABLE:
+            raise ImportError("use_onnx=True requires onnxruntime (pip install onnxruntime)")
+        # bf16 weights on GPUs that support it: the forward pass is bound by weight reads,
+        # so half the bytes is close to twice the throughput. Pooling still runs in fp32.
+        dtype = (
+            torch.bfloat16
+            if self.device.type == "cuda" and torch.cuda.is_bf16_supported() and not use_onnx
+            else torch.float32
+        )
+        self.model = AutoModel.from_pretrained(model_name, torch_dtype=dtype).to(self.device)
+        self.model.eval()
+        # Weights are never trained here: no parameter needs grad, even outside inference_mode
+        # (e.g. the ONNX export trace). Preferred over a global torch.set_grad_enabled(False),
+        # which is thread-local and would leak into the rest of the process.
+        self.model.requires_grad_(False)
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.dim = self.model.config.hidden_size
+
+        self.session = None
+        if use_onnx:
+            onnx_path = ONNX_CACHE_DIR / f"{model_name.replace('/', '--')}-embedder.onnx"
+            if not onnx_path.exists():
+                self._export_onnx(onnx_path)
+            providers = ["CPUExecutionProvider"]
+            if self.device.type == "cuda":
+                providers.insert(0, "CUDAExecutionProvider")
+            self.session = ort.InferenceSession(str(onnx_path), providers=providers)
+            self.model = None  # the session replaces the torch model; free its weights
+        elif compile_model and self.device.type == "cuda" and hasattr(torch, "compile"):
+            # Single-query embedding is launch-bound: CUDA graphs ("reduce-overhead") replay the
+            # whole forward pass as one launch. dynamic=True since batch/sequence sizes vary.
+            self.model = torch.compile(self.model, mode="reduce-overhead", dynamic=True)
+            self._encode(["warmup", "warmup"])  # compile once here, not on the first request
+
+    def _export_onnx(self, path: Path) -> None:
+        """Export the transformer with dynamic batch/sequence axes (fp32, opset 17)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        dummy = self.tokenizer(["warmup"], return_tensors="pt").to(self.device)
+        dynamic = {0: "batch", 1: "seq"}
+        torch.onnx.export(
+            self.model,
+            (dummy["input_ids"], dummy["attention_mask"]),
+            str(path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={"input_ids": dynamic, "attention_mask": dynamic, "last_hidden_state": dynamic},
+            opset_version=17,
+        )
+
+    def _encode(self, texts: List[str], batch_size: int | None = None) -> np.ndarray:
+        """
+        Embed texts as an L2-normalized float32 array of shape (N, D), in input order.
+
+        All texts are tokenized in one call (no padding), then encoded in token-length order:
+        each batch holds texts of similar length and is padded only to its own longest one
+        (few FLOPs spent on pad tokens).
+        """
+        embeddings = np.empty((len(texts), self.dim), dtype=np.float32)
+        if not texts:
+            return embeddings
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        order = sorted(range(len(texts)), key=lambda i: len(encoded["input_ids"][i]))
+
+        with torch.inference_mode():
+            batch_size = batch_size or self.batch_size
+            for start in range(0, len(order), batch_size):
+                batch_idx = order[start : start + batch_size]
+                features = {key: [encoded[key][i] for i in batch_idx] for key in ("input_ids", "attention_mask")}
+                embeddings[batch_idx] = self._forward(features)
+        return embeddings
+
+    def _forward(self, features: Dict[str, List[List[int]]]) -> np.ndarray:
+        """Pooled, normalized embeddings for one batch of (unpadded) token ids."""
+        if self.session is not None:
+            inputs = self.tokenizer.pad(features, return_tensors="np")
+            attention_mask = inputs["attention_mask"].astype(np.int64)
+            hidden = self.session.run(
+                ["last_hidden_state"],
+                {"input_ids": inputs["input_ids"].astype(np.int64), "attention_mask": attention_mask},
+            )[0]
+            return self._mean_pool_np(hidden, attention_mask)
+
+        inputs = self.tokenizer.pad(features, return_tensors="pt").to(self.device)
+        hidden = self.model(**inputs).last_hidden_state
+        return self._mean_pool(hidden, inputs["attention_mask"]).cpu().numpy()
+
+    @staticmethod
+    def _mean_pool_np(hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """NumPy version of _mean_pool for the ONNX Runtime outputs."""
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden.astype(np.float32, copy=False) * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled
+
+    @staticmethod
+    def _mean_pool(hidden: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """Average the non-padding token vectors of each row, then L2-normalize."""
+        hidden = hidden.float()  # accumulate in fp32 even when the model runs in bf16
+        mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+        summed = (hidden * mask).sum(dim=1)
+        counts = mask.sum(dim=1).clamp(min=1e-9)
+        return F.normalize(summed / counts, p=2, dim=1)
+
+    def embed_documents_np(self, texts: List[str], batch_size: int | None = None, **api_options) -> np.ndarray:
+        """
+        Embed documents as a float32 array of shape (N, D); batch_size overrides the default.
+        Accepts (and ignores) OpenAIEmbedder's request options such as concurrency,
+        so the index builder can call either embedder the same way.
+        """
+        return self._encode(texts, batch_size=batch_size)
+
+    def embed_query_np(self, text: str) -> np.ndarray:
+        return self._encode([text])[0]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0].tolist()
+
+    embed = embed_query
@@ -0,0 +1,30 @@
+"""Shared OpenAI client.
+
+Creating a new ``OpenAI`` client per embedder/model means a new connection pool
+and a fresh TLS handshake. One long-lived client per API key is reused instead,
+with keep-alive connections and HTTP/2 when the optional ``h2`` package is installed.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import httpx
+from openai import OpenAI
+
+# HTTP/2 support in httpx is optional (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+@lru_cache(maxsize=4)
+def shared_openai_client(api_key: str) -> OpenAI:
+    """Return the process-wide OpenAI client for this API key."""
+    http_client = httpx.Client(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
@@ -1,14 +1,20 @@
+from functools import lru_cache
 from typing import List
 import yaml
 from pathlib import Path
 
+# libyaml's C loader when available (much faster), pure-Python SafeLoader otherwise
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@lru_cache(maxsize=1)
 def _load_config() -> dict:
-    """Load configuration from config.yml file."""
+    """Load configuration from config.yml file (parsed once per process)."""
     # core/ -> business/ -> src/ -> config/config.yml
     config_path = Path(__file__).resolve().parents[2] / "config" / "config.yml"
     with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
+@lru_cache(maxsize=1)
 def _get_system_role() -> str:
     """Get LLM system role from config.yml."""
     config = _load_config()
@@ -20,6 +26,16 @@ class PromptBuilder:
     Sent to the LLM to generate responses based on user input and context in RAG pipeline.
     """
 
+    # Static parts of every prompt - built once instead of on every query
+    _HEADER = "Use the following context to answer the question.\n"
+    _RULES = (
+        "Rules:\n"
+        "- Answer based only on the provided context.\n"
+        '- If the answer is not in the context, respond with "I don\'t know."\n'
+        "- Be concise and to the point.\n"
+        "- Do not invent information.\n"
+    )
+
     def __init__(self, system_prompt: str = None):
         """
         Initialize PromptBuilder.
@@ -30,42 +46,42 @@ class PromptBuilder:
         # Use config value if system_prompt not provided
         self.system_prompt = system_prompt or _get_system_role()
 
+    def _user_message(self, question: str, context: List[str]) -> str:
+        """
+        Header + numbered context passages + question + rules.
+        Without context (plain chat turn) it is just the question - no header or rules tokens.
+        """
+        if not context:
+            return question
+        return self._HEADER + self.context_and_question(question, context)
+
+    def context_and_question(self, question: str, context: List[str]) -> str:
+        """
+        The per-query part of the user message (everything after the static header).
+        """
+        context_block = "\n\n".join([f"[Context {i}]: {ctx}" for i, ctx in enumerate(context, 1)])
+        return f"{context_block}\nQuestion: {question}\n{self._RULES}"
+
+    def static_prefix_text(self) -> str:
+        """
+        Start of every prompt_text that has context: system prompt + header.
+        Identical across queries, so local models can tokenize it once.
+        """
+        return f"{self.system_prompt}\n{self._HEADER}".lstrip()
+
     def build_prompt_text(self, question: str, context: List[str]) -> str:
         """
         Constructs the full prompt (plain text) for completion-style models.
         """
-        context_block = "\n\n".join(f"[Context {i+1}]: {ctx}" for i, ctx in enumerate(context))
-        full_prompt = f"""
-        {self.system_prompt}
-        Use the following context to answer the question.
-        {context_block}
-        Question: {question}
-        Rules:
-        - Answer based only on the provided context.
-        - If the answer is not in the context, respond with "I don't know."
-        - Be concise and to the point.
-        - Do not invent information.
-        """
-        return full_prompt.strip()
+        return f"{self.system_prompt}\n{self._user_message(question, context)}".strip()
 
     def build_messages(self, question: str, context: List[str]):
         """
         Constructs chat messages for OpenAI Chat Completions API.
         """
-        context_block = "\n\n".join(f"[Context {i+1}]: {ctx}" for i, ctx in enumerate(context))
-        user_msg = (
-            "Use the following context to answer the question.\n"
-            f"{context_block}\n"
-            f"Question: {question}\n"
-            "Rules:\n"
-            '- Answer based only on the provided context.\n'
-            '- If the answer is not in the context, respond with "I don\'t know."\n'
-            "- Be concise and to the point.\n"
-            "- Do not invent information.\n"
-        )
         return [
             {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": user_msg},
+            {"role": "user", "content": self._user_message(question, context)},
         ]
 
     # Backwards compatibility
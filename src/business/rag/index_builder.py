@@ -15,7 +15,7 @@ from dotenv import load_dotenv
 
 from .pdfingest.unstructure_pdf_digest import ingest_directory, IngestedDocument
 from .pdfingest.chunk import Chunker, Chunk
-from ..core.embedding import OpenAIEmbedder
+from ..core.embedding import make_embedder
 from .vector_store import VectorStore
 
 
@@ -39,44 +39,40 @@ def build_index(
     chunk_size: int = 800,
     overlap: int = 100,
     top_k_store: int | None = None,
+    num_workers: int | None = None,
+    embed_batch_size: int = 96,
+    embed_concurrency: int = 8,
 ) -> Tuple[int, int]:
     """
     Build or rebuild the vector index from PDFs.
+    PDFs are parsed in up to num_workers processes; embedding stays in this process and
+    sends chunks in batches of embed_batch_size, embed_concurrency requests at a time.
     Returns (docs_indexed, chunks_indexed).
     """
     load_dotenv()
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY missing in environment")
+    embedder = make_embedder(os.getenv("OPENAI_API_KEY"))
 
     docs = ingest_directory(
         data_dir=data_dir,
         max_context_chars=max_context_chars,
         include_table_images=include_table_images,
+        num_workers=num_workers,
     )
 
-    embedder = OpenAIEmbedder(api_key=api_key)
     vstore = VectorStore(persist_dir=str(persist_dir))
     chunker = Chunker(chunk_size=chunk_size, overlap=overlap)
 
     all_chunks: List[Chunk] = []
     for doc in docs:
-        # use marker to identify start of table section
-        table_marker = None
-        if doc.table_text:
-            # compute start idx of table section for provenance tagging
-            marker = "\n\n" + "=" * 80 + "\nTABLES FROM DOCUMENT IMAGES:\n" + "=" * 80 + "\n"
-            table_marker = doc.combined_text.find(marker)
-            if table_marker == -1:
-                table_marker = None
-        doc_chunks = _chunk_document(doc, chunker, table_start_idx=table_marker)
+        # ingestion records where the table section starts, used for provenance tagging
+        doc_chunks = _chunk_document(doc, chunker, table_start_idx=doc.table_start_idx)
         all_chunks.extend(doc_chunks)
 
     if top_k_store:
         all_chunks = all_chunks[:top_k_store]
 
     texts = [c.text for c in all_chunks]
-    embeddings = embedder.embed_documents(texts)
+    embeddings = embedder.embed_documents_np(texts, batch_size=embed_batch_size, concurrency=embed_concurrency)
     ids = [c.chunk_id for c in all_chunks]
     metadatas = [c.metadata for c in all_chunks]
 
@@ -2,9 +2,29 @@
 
 from dataclasses import dataclass
 from importlib import metadata
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any
 import hashlib
 
+# Hash functions available for chunk IDs. IDs are only used for dedup/upsert, so a fast
+# non-cryptographic hash is fine; sha1 stays the default so existing indexes keep their IDs.
+_CHUNK_ID_HASHERS: Dict[str, Callable[[], Any]] = {
+    "sha1": hashlib.sha1,
+    "blake2b": lambda: hashlib.blake2b(digest_size=20),
+}
+
+# Optional faster SIMD hashers
+try:
+    import blake3
+    _CHUNK_ID_HASHERS["blake3"] = blake3.blake3
+except ImportError:
+    pass
+
+try:
+    import xxhash
+    _CHUNK_ID_HASHERS["xxh128"] = xxhash.xxh128
+except ImportError:
+    pass
+
 @dataclass
 class Chunk:
     chunk_id: str
@@ -23,12 +43,22 @@ class Chunker:
         chunk_size: int = 800,
         overlap: int = 100,
         strategy_name: str = "char_window_800_overlap_100",
+        hash_algo: str = "sha1",
     ):
+        """
+        hash_algo: chunk ID hash - "sha1" (default), "blake2b", or "blake3"/"xxh128" if installed.
+        IDs are 40 hex chars, except xxh128 (a 128-bit hash: 32 hex chars).
+        Changing it changes every chunk ID, so rebuild (reset) existing indexes when switching.
+        """
         assert overlap < chunk_size, "overlap must be smaller than chunk_size"
+        if hash_algo not in _CHUNK_ID_HASHERS:
+            raise ValueError(f"Unsupported hash_algo {hash_algo!r}; available: {sorted(_CHUNK_ID_HASHERS)}")
 
         self.chunk_size = chunk_size
         self.overlap = overlap
         self.strategy_name = strategy_name
+        self.hash_algo = hash_algo
+        self._new_hasher = _CHUNK_ID_HASHERS[hash_algo]
 
     def split(self,text: str, source_metadata: Dict,
     ) -> List[Chunk]:
@@ -44,26 +74,40 @@ class Chunker:
             return []
 
         chunks: List[Chunk] = []
-        start = 0
         text_length = len(text)
+        step = self.chunk_size - self.overlap
+        source_id = source_metadata.get("source_id", "").encode("utf-8")  # Pdf files Name, encoded once per document
 
-        while start < text_length:
+        # Window starts are a fixed arithmetic sequence; stop after the window that reaches the end
+        # (otherwise start = end - overlap would revisit the last window forever).
+        for start in range(0, text_length, step):
             end = min(start + self.chunk_size, text_length)
-            chunk_text = text[start:end].strip()
+            chunk_text = text[start:end]
+            # Only pay for strip() (a second copy) when the window actually has edge whitespace
+            if chunk_text[0].isspace() or chunk_text[-1].isspace():
+                chunk_text = chunk_text.strip()
 
             if chunk_text:
-                chunk_id = self._build_chunk_id(chunk_text=chunk_text,start=start,source_metadata=source_metadata,)
-                metadata = {**source_metadata,"chunk_start": start,"chunk_end": end,"chunk_strategy": self.strategy_name,}
+                chunk_id = self._build_chunk_id(chunk_text=chunk_text,start=start,source_id=source_id,)
+                metadata = source_metadata.copy()
+                metadata["chunk_start"] = start
+                metadata["chunk_end"] = end
+                metadata["chunk_strategy"] = self.strategy_name
                 chunks.append(Chunk(chunk_id=chunk_id,text=chunk_text,metadata=metadata,))
-            start = end - self.overlap
+
+            if end == text_length:
+                break
         return chunks
-    def _build_chunk_id(self,chunk_text: str,start: int,source_metadata: Dict,) -> str:
+    def _build_chunk_id(self,chunk_text: str,start: int,source_id: bytes,) -> str:
         """
         Build stable chunk ID 
         """
-        base = (
-            source_metadata.get("source_id", "")  #Pdf files Name
-            + str(start)
-            + chunk_text[:100]
-        )
-        return hashlib.sha1(base.encode("utf-8")).hexdigest()
\ No newline at end of file
+        # Feed the parts to the hasher one by one instead of concatenating them first
+        # (same digest as hashing source_id + str(start) + chunk_text[:100]).
+        h = self._new_hasher()
+        h.update(source_id)
+        h.update(b"%d" % start)  # int -> ASCII bytes directly, no intermediate str
+        h.update(chunk_text[:100].encode("utf-8"))
+        # 40 hex chars (same length as the original SHA-1 IDs) for the 160+-bit hashes;
+        # xxh128 only has 128 bits, so its IDs are 32 hex chars
+        return h.hexdigest()[:40]
\ No newline at end of file
@@ -7,11 +7,13 @@ extracts table content using the Unstructured API, and saves the results
 to JSON files.
 """
 import os
-import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 from dotenv import load_dotenv
+import orjson
 import unstructured_client
 from unstructured_client.models import operations, shared
 
@@ -47,6 +49,9 @@ OUTPUT_DIR = SCRIPT_DIR / "artifacts" / "tables_json"
 # Create output directory if it doesn't exist
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Max concurrent Unstructured API requests when processing a folder of images
+MAX_API_WORKERS = 16
+
 
 # ============================================================
 # Image Processing Functions
@@ -66,10 +71,13 @@ def process_image(image_path: Path) -> List[Dict[str, Any]]:
 
     try:
         client = get_client()
+        # Read the bytes up front so the file handle is closed immediately
+        with image_path.open("rb") as fh:
+            content = fh.read()
         req = operations.PartitionRequest(
             partition_parameters=shared.PartitionParameters(
                 files=shared.Files(
-                    content=open(image_path, "rb"),
+                    content=content,
                     file_name=image_path.name,
                 ),
                 strategy=shared.Strategy.HI_RES,  # Required for images
@@ -102,23 +110,55 @@ def save_to_json(elements: List[Dict[str, Any]], output_path: Path) -> None:
         elements: List of element dictionaries
         output_path: Path to save JSON file
     """
-    json_content = json.dumps(elements, indent=2, default=str) 
-    
-    with open(output_path, "w", encoding="utf-8") as file:
-        file.write(json_content)
+    # orjson serializes straight to UTF-8 bytes in C; default=str covers non-JSON values
+    output_path.write_bytes(orjson.dumps(elements, option=orjson.OPT_INDENT_2, default=str))
     
     print(f"✅ Saved: {output_path.name} ({len(elements)} tables)")
-    
+
+
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg"})
+
+
+@lru_cache(maxsize=16)
+def _scan_image_files(image_dir: str, dir_mtime_ns: int) -> Tuple[Path, ...]:
+    # dir_mtime_ns is part of the cache key only: adding/removing files changes the
+    # directory's mtime, so a folder that partition_pdf has written to is scanned again
+    with os.scandir(image_dir) as entries:
+        return tuple(
+            Path(entry.path) for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+        )
+
+
+def list_image_files(image_dir: Path) -> List[Path]:
+    """
+    JPG/JPEG files in image_dir (extension match is case-insensitive).
+    The listing is cached until the directory changes, so repeated calls skip the scan.
+    """
+    return list(_scan_image_files(str(image_dir), os.stat(image_dir).st_mtime_ns))
+
+
 # ============================================================
 # Table Text Extraction Function
 # ============================================================
 # Now that we have the tables seperately, we can extract the text from them.
 
-def extract_table_text_from_images(image_dir: Path = None) -> str:
+def _partition_images(image_files: List[Path], max_workers: int = MAX_API_WORKERS) -> List[List[Dict[str, Any]]]:
+    """
+    process_image() for every file, concurrently; results are in the same order as image_files.
+    OCR runs on the Unstructured API server, so each call is a network round-trip and
+    threads (not processes) are enough to overlap them.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(image_files)))) as executor:
+        return list(executor.map(process_image, image_files))
+
+
+def extract_table_text_from_images(image_dir: Path = None, max_workers: int = MAX_API_WORKERS) -> str:
     """
     Process all JPG images containing tables and extract table text content.
     Args:
         image_dir: Directory containing images (defaults to IMAGE_DIR)
+        max_workers: Max concurrent Unstructured API requests
     Returns:
         Combined text content from all tables found in images
     """
@@ -126,11 +166,7 @@ def extract_table_text_from_images(image_dir: Path = None) -> str:
         image_dir = IMAGE_DIR
     
     # Find all JPG/JPEG images
-    image_extensions = [".jpg", ".jpeg", ".JPG", ".JPEG"]
-    image_files = [
-        f for f in image_dir.iterdir()
-        if f.is_file() and f.suffix in image_extensions
-    ]
+    image_files = list_image_files(image_dir)
     
     if not image_files:
         print(f"⚠️  No JPG images found in {image_dir}")
@@ -140,11 +176,10 @@ def extract_table_text_from_images(image_dir: Path = None) -> str:
     
     all_table_texts = []
     total_tables = 0
+
+    all_elements = _partition_images(image_files, max_workers)
     
-    for image_path in image_files:
-        # Process image
-        elements = process_image(image_path)
-        
+    for image_path, elements in zip(image_files, all_elements):
         # Filter for tables only
         tables = filter_tables(elements)
         
@@ -178,18 +213,13 @@ def process_all_images() -> None:
     Process all JPG images in the images directory and save table content to JSON.
     Extracts all elements from images, filters to keep only table text, and saves to JSON.
     """
-    image_extensions = [".jpg", ".jpeg", ".JPG", ".JPEG"]
-    image_files = [
-        f for f in IMAGE_DIR.iterdir()
-        if f.is_file() and f.suffix in image_extensions
-    ]
+    image_files = list_image_files(IMAGE_DIR)
     
     if not image_files:
         print(f"⚠️  No JPG images found in {IMAGE_DIR}")
         return
     
-    for image_path in image_files:
-        elements = process_image(image_path)
+    for image_path, elements in zip(image_files, _partition_images(image_files)):
         tables = filter_tables(elements)
         
         if tables:
@@ -12,9 +12,11 @@ Downstream steps (chunk → embed → index) can consume the returned
 from __future__ import annotations
 
 import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from unstructured.partition.pdf import partition_pdf
@@ -31,12 +33,12 @@ except Exception:
 load_dotenv()
 
 
-USEFUL_CATEGORIES = {
+USEFUL_CATEGORIES = frozenset({
     "Title",
     "NarrativeText",
     "ListItem",
     "Table",  # tables directly parsed from the PDF pages
-}
+})
 
 
 @dataclass
@@ -46,6 +48,8 @@ class IngestedDocument:
     table_text: str
     combined_text: str
     metadata: Dict[str, int]
+    # Offset in combined_text where the table-image section (separator) starts; None if absent
+    table_start_idx: Optional[int] = None
 
 
 def _load_pdf_elements(pdf_path: Path, image_output_dir: Path, strategy: str = "hi_res"):
@@ -61,18 +65,21 @@ def _load_pdf_elements(pdf_path: Path, image_output_dir: Path, strategy: str = "
     )
 
 
-def _text_blocks_from_elements(elements) -> List[str]:
-    return [
-        el.text.strip()
-        for el in elements
-        if getattr(el, "category", None) in USEFUL_CATEGORIES and getattr(el, "text", None)
-    ]
-
-
-def _count_tables(elements) -> int:
-    return len([
-        el for el in elements if getattr(el, "category", None) == "Table" and getattr(el, "text", None)
-    ])
+def _extract_text_blocks(elements) -> Tuple[List[str], int]:
+    """
+    One pass over the elements: useful text blocks plus the number of PDF tables among them.
+    unstructured elements always carry .category and .text, so plain attribute access is enough.
+    """
+    text_blocks: List[str] = []
+    table_count = 0
+    for el in elements:
+        category = el.category
+        text = el.text
+        if category in USEFUL_CATEGORIES and text:
+            text_blocks.append(text.strip())
+            if category == "Table":
+                table_count += 1
+    return text_blocks, table_count
 
 
 def ingest_single_pdf(
@@ -87,8 +94,7 @@ def ingest_single_pdf(
     """
     elements = _load_pdf_elements(pdf_path, image_output_dir=image_output_dir, strategy=pdf_strategy)
 
-    text_blocks = _text_blocks_from_elements(elements)
-    pdf_tables_count = _count_tables(elements)
+    text_blocks, pdf_tables_count = _extract_text_blocks(elements)
 
     table_text = ""
     if include_table_images and _TABLE_PROCESSING_AVAILABLE:
@@ -101,8 +107,10 @@ def ingest_single_pdf(
         "\n\n" + "=" * 80 + "\n" + "TABLES FROM DOCUMENT IMAGES:\n" + "=" * 80 + "\n"
     )
 
+    table_start_idx = None
     if table_text:
         combined_text = pdf_text_only + separator + table_text
+        table_start_idx = len(pdf_text_only)
 
     # Trim to budget while preferring PDF text first, then table text.
     if len(combined_text) > max_context_chars:
@@ -111,8 +119,10 @@ def ingest_single_pdf(
             if available_for_pdf > 0:
                 pdf_part = pdf_text_only[:available_for_pdf]
                 combined_text = pdf_part + separator + table_text
+                table_start_idx = len(pdf_part)
             else:
                 combined_text = pdf_text_only[:max_context_chars]
+                table_start_idx = None
         else:
             combined_text = pdf_text_only[:max_context_chars]
 
@@ -128,6 +138,7 @@ def ingest_single_pdf(
         table_text=table_text,
         combined_text=combined_text,
         metadata=metadata,
+        table_start_idx=table_start_idx,
     )
 
 
@@ -137,9 +148,11 @@ def ingest_directory(
     max_context_chars: int = 12_000,
     include_table_images: bool = True,
     pdf_strategy: str = "hi_res",
+    num_workers: Optional[int] = None,
 ) -> List[IngestedDocument]:
     """Ingest all PDFs in a directory and return structured results.
     pdf_strategy: 'hi_res' (OCR, slower) | 'fast' (no OCR, faster).
+    num_workers: processes used to parse PDFs in parallel (default: min(cpu_count, 4); 1 = serial).
     """
     if image_output_dir is None:
         image_output_dir = data_dir / ".." / "artifacts" / "images"
@@ -150,16 +163,35 @@ def ingest_directory(
     if not pdf_files:
         raise FileNotFoundError(f"No PDF files found in {data_dir}")
 
-    results: List[IngestedDocument] = []
-    for pdf_path in pdf_files:
-        results.append(
-            ingest_single_pdf(
-                pdf_path=pdf_path,
-                image_output_dir=image_output_dir,
-                max_context_chars=max_context_chars,
-                include_table_images=include_table_images,
-                pdf_strategy=pdf_strategy,
-            )
-        )
-    return results
+    # One image folder per PDF: extract_table_text_from_images() scans the whole folder, so a
+    # shared folder would make every worker OCR every other PDF's table images as well.
+    # Folders are created here in the parent, before any work is handed to a worker.
+    image_dirs = [image_output_dir / pdf_path.stem for pdf_path in pdf_files]
+    for image_dir in image_dirs:
+        image_dir.mkdir(parents=True, exist_ok=True)
+
+    ingest_one = partial(
+        ingest_single_pdf,
+        max_context_chars=max_context_chars,
+        include_table_images=include_table_images,
+        pdf_strategy=pdf_strategy,
+    )
 
+    if num_workers is None:
+        num_workers = min(os.cpu_count() or 1, 4)
+    num_workers = min(num_workers, len(pdf_files))
+
+    if num_workers <= 1:
+        return [
+            ingest_one(pdf_path, image_output_dir=image_dir)
+            for pdf_path, image_dir in zip(pdf_files, image_dirs)
+        ]
+
+    # partition_pdf is CPU-bound and single-threaded, so parse files in separate processes.
+    # Each submit is one PDF, so slow files don't hold up others; results keep input order.
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(ingest_one, pdf_path, image_output_dir=image_dir)
+            for pdf_path, image_dir in zip(pdf_files, image_dirs)
+        ]
+        return [future.result() for future in futures]
@@ -26,6 +26,14 @@ class ReRankerConfig:
     # Scoring Strategy
     blend_with_vector_score: bool = False
     blend_alpha: float = 0.5        # α * rerank + (1-α) * vector
+    # Skip the model when the vector store returns <= top_n_output candidates (all would be sent anyway).
+    # Off by default: skipping also skips min_score gating; order then stays the vector-store order.
+    skip_when_few_candidates: bool = False
 
     # Performance
-    batch_size: int = 8
\ No newline at end of file
+    batch_size: int = 8
+    max_length: int = 512   # tokens per (query, chunk) pair; caps runaway long chunks
+    score_cache_size: int = 4096  # (query, chunk_id) -> score LRU entries; 0 disables
+    compile_model: bool = True  # torch.compile the torch model on GPU (ignored on CPU and for the ONNX model)
+    # Opt-in: on CPU, run an INT8-quantized ONNX export (needs optimum). Faster, but scores shift slightly.
+    onnx_int8: bool = False
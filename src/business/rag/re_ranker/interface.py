@@ -8,10 +8,11 @@ from abc import ABC, abstractmethod
 # Data Contracts
 # =========================
 
-@dataclass
+@dataclass(slots=True)
 class RetrievedChunk:
     """
     Chunk returned from the VectorDB before re-ranking.
+    slots=True: no per-instance __dict__, so building many of them per query is cheaper.
     """
     chunk_id: str
     text: str
@@ -19,7 +20,7 @@ class RetrievedChunk:
     vector_score: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ReRankedChunk(RetrievedChunk):
     """
     Chunk after re-ranking.
@@ -16,6 +16,7 @@ Option C — Hybrid (recommended default)
     If empty → fall back to vector results and mark low confidence
     Log the event
 """
+import heapq
 from typing import List, Tuple
 
 from .re_ranker import ReRanker
@@ -47,6 +48,12 @@ def select_context(
         return [], "none"
 
     # Case 3: Fail-open / hybrid fallback
-    fallback_chunks = retrieved_chunks[: reranker.config.top_n_output]
+    # Best n by vector score without relying on the input order. vector_score holds the
+    # Chroma distance (smaller = closer); ties keep their retrieval order.
+    fallback_chunks = heapq.nsmallest(
+        reranker.config.top_n_output,
+        retrieved_chunks,
+        key=lambda chunk: chunk.vector_score,
+    )
 
     return fallback_chunks, "low"
\ No newline at end of file
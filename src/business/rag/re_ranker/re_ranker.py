@@ -1,6 +1,7 @@
 # Some part of this project is for the RAG system and some parts are for the chatbot system.
 # The Re-Ranker is only used in the RAG system.
 
+import heapq
 from typing import List
 
 from .config import ReRankerConfig
@@ -55,6 +56,14 @@ class ReRanker:
         # 1. Limit input size (recall control)
         candidates = chunks[: self.config.top_k_input]
 
+        # Fast path: nothing to choose between - keep the vector-store order, no model call
+        if (
+            self.config.skip_when_few_candidates
+            and not self.config.blend_with_vector_score
+            and len(candidates) <= self.config.top_n_output
+        ):
+            return [self._unscored(chunk) for chunk in candidates]
+
         # 2. Score relevance (model-dependent)
         scored_chunks = self.scorer.score(
             query=query,
@@ -67,20 +76,31 @@ class ReRanker:
         if not gated_chunks:
             return []
 
-        # 4. Sort by relevance score (descending)
-        ranked_chunks = sorted(
+        # 4 + 5. Top-n by relevance score (descending) - a bounded heap, O(n log top_n),
+        # same result as sorted(..., reverse=True)[:top_n]; the key runs once per chunk
+        return heapq.nlargest(
+            self.config.top_n_output,
             gated_chunks,
             key=self._final_score,
-            reverse=True,
         )
 
-        # 5. Truncate to top-n (context control)
-        return ranked_chunks[: self.config.top_n_output]
-
     # =========================
     # Internal helpers
     # =========================
 
+    @staticmethod
+    def _unscored(chunk: RetrievedChunk) -> ReRankedChunk:
+        """
+        Wrap a chunk that was not sent to the scorer; rerank_score carries its vector score.
+        """
+        return ReRankedChunk(
+            chunk_id=chunk.chunk_id,
+            text=chunk.text,
+            metadata=chunk.metadata,
+            vector_score=chunk.vector_score,
+            rerank_score=chunk.vector_score,
+        )
+
     def _apply_gating(
         self,
         chunks: List[ReRankedChunk],
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import List, Tuple
+import threading
+from typing import Iterator, List, Tuple
 
+from cachetools import LRUCache
 from dotenv import load_dotenv
-from openai import OpenAI
+import numpy as np
 
-from ..core.embedding import OpenAIEmbedder
+from ..core.embedding import make_embedder
+from ..core.openai_client import shared_openai_client
 from .vector_store import VectorStore
 from .re_ranker.interface import RetrievedChunk, ReRankedChunk
 from .re_ranker.re_ranker import ReRanker
@@ -33,33 +37,58 @@ class RAGPipeline:
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY missing in environment")
 
-        self.embedder = OpenAIEmbedder(api_key=api_key)
+        self.embedder = make_embedder(api_key)  # EMBEDDER=openai|local, same as the index builder
+        # In-memory LRU of query embeddings in front of the embedder's on-disk cache:
+        # a repeated question skips both the API call and the SQLite lookup
+        self._query_emb_cache: LRUCache = LRUCache(maxsize=512)
+        self._query_emb_lock = threading.Lock()
         self.vector_store = VectorStore(persist_dir=persist_dir, collection_name=collection_name)
 
         scorer = CrossEncoderReRanker(reranker_config or ReRankerConfig())
+        scorer.load_in_background()  # model loads while the rest of the pipeline is set up
         self.reranker = ReRanker(scorer=scorer, config=reranker_config or ReRankerConfig())
 
         self.prompt_builder = PromptBuilder(system_prompt)
-        self.llm = OpenAIModel(client=OpenAI(api_key=api_key), model_name=model_name, system_prompt=system_prompt)
+        self.llm = OpenAIModel(client=shared_openai_client(api_key), model_name=model_name, system_prompt=system_prompt)
+
+    async def awarmup(self) -> None:
+        """
+        Pay every first-call cost up front, concurrently: the OpenAI round-trip (TCP/TLS
+        connection setup), loading the Chroma index and the re-ranker's first forward pass.
+        The network wait overlaps with the local work, so startup takes max(...) not sum(...).
+        """
+        warmup_chunk = RetrievedChunk(chunk_id="__warmup__", text="warmup", metadata={}, vector_score=0.0)
+        await asyncio.gather(
+            self.embedder.aembed_query("warmup"),
+            asyncio.to_thread(self.vector_store.collection.count),
+            asyncio.to_thread(self.reranker.scorer.score, "warmup", [warmup_chunk]),
+        )
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        with self._query_emb_lock:
+            q_emb = self._query_emb_cache.get(query)
+        if q_emb is None:
+            q_emb = self.embedder.embed_query_np(query)
+            q_emb.setflags(write=False)  # shared between calls - must not be modified in place
+            with self._query_emb_lock:
+                self._query_emb_cache[query] = q_emb
+        return q_emb
 
     def _retrieve(self, query: str, top_k: int = 30) -> List[RetrievedChunk]:
-        q_emb = self.embedder.embed_query(query)
+        q_emb = self._embed_query(query)
         result = self.vector_store.query(q_emb, top_k)
-        retrieved: List[RetrievedChunk] = []
         ids = result.get("ids", [[]])[0]
         docs = result.get("documents", [[]])[0]
         metas = result.get("metadatas", [[]])[0]
         dists = result.get("distances", [[]])[0]
-        for chunk_id, doc, meta, dist in zip(ids, docs, metas, dists):
-            retrieved.append(
-                RetrievedChunk(
-                    chunk_id=chunk_id,
-                    text=doc,
-                    metadata=meta or {},
-                    vector_score=float(dist) if dist is not None else 0.0,
-                )
-            )
-        return retrieved
+        # Positional construction straight from the parallel result columns
+        return list(map(
+            RetrievedChunk,
+            ids,
+            docs,
+            (meta or {} for meta in metas),
+            (float(dist) if dist is not None else 0.0 for dist in dists),
+        ))
 # The answer function is the orchestration of the RAG pipeline not just the retrieval step.
     def answer(self, question: str) -> Tuple[str,list[ReRankedChunk]]:
         # Step 1: Retrieve relevant chunks
@@ -75,3 +104,12 @@ class RAGPipeline:
         answer = self.llm.generate(question, [chunk.text for chunk in selected_context])
         
         return answer, selected_context
+
+    def answer_stream(self, question: str) -> Iterator[str]:
+        """
+        Streaming variant of answer(): retrieval and re-ranking run up front,
+        then the LLM response is yielded as it is generated.
+        """
+        retrieved_chunks = self._retrieve(question, top_k=self.reranker.config.top_k_input)
+        selected_context, _ = select_context(question, retrieved_chunks, self.reranker)
+        yield from self.llm.generate_stream(question, [chunk.text for chunk in selected_context])
@@ -21,9 +21,9 @@ we still need DTOs to:
 
 
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 class ChatMessageRequest(BaseModel):
@@ -40,16 +40,29 @@ class ChatMessageRequest(BaseModel):
     user_id: Optional[int] = Field(None, description="User identifier")
     session_id: Optional[str] = Field(None, description="Chat session identifier")
     context: Optional[dict] = Field(None, description="Additional context/metadata")
+    stream: bool = Field(False, description="Stream the reply as server-sent events")
+
+    @field_validator("message")
+    @classmethod
+    def _message_not_empty(cls, v: str) -> str:
+        # Rejected with a 422 by FastAPI before the endpoint coroutine runs
+        v = v.strip()
+        if not v:
+            raise ValueError("Message cannot be empty")
+        return v
     
-    class Config:
-        json_schema_extra = {
+    # Pydantic v2 style config (the v1 inner `class Config` is deprecated)
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "message": "What's the weather like today?",
                 "user_id": 1,
                 "session_id": "abc123",
-                "context": {"timezone": "UTC"}
+                "context": {"timezone": "UTC"},
+                "stream": False
             }
         }
+    )
 
 
 class ChatMessageResponse(BaseModel):
@@ -59,14 +72,15 @@ class ChatMessageResponse(BaseModel):
     Even though the LLM response is free-form text, we structure it
     with metadata for better API design.
     """
-    reply: str = Field(..., description="Free-form LLM response - any format")
+    reply: str = Field("I'm sorry, I couldn't process that.", description="Free-form LLM response - any format")
     session_id: Optional[str] = Field(None, description="Chat session identifier")
-    timestamp: datetime = Field(default_factory=datetime.now)
-    model_used: Optional[str] = Field(None, description="LLM model identifier")
+    # timezone-aware UTC: serialized with an explicit offset, no local-time ambiguity
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    model_used: Optional[str] = Field("zephyr-7b-beta", description="LLM model identifier")
     tokens_used: Optional[int] = Field(None, description="Token count for this response")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "reply": "The weather is sunny and 72°F today.",
                 "session_id": "abc123",
@@ -75,6 +89,7 @@ class ChatMessageResponse(BaseModel):
                 "tokens_used": 45
             }
         }
+    )
 
 
 class ChatHistoryRequest(BaseModel):
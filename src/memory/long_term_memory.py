@@ -1,9 +1,11 @@
-from typing import List, Dict, TYPE_CHECKING
+import asyncio
+import uuid
+from typing import TYPE_CHECKING, Dict, List
 from datetime import datetime
 
 # Type checking only - avoids circular imports
 if TYPE_CHECKING:
-    from src.memory.vectordb import VectorDB
+    from src.memory.vectordb import SearchResults, VectorDB
 
 
 class LongTermMemory:
@@ -26,7 +28,8 @@ class LongTermMemory:
         
         Args:
             vectordb: Vector database instance (from src.memory.vectordb.VectorDB)
-            embedder: Embedding model (must have embed(text: str) or embed_query(text: str) method)
+            embedder: Embedding model (must have embed(text: str) or embed_query(text: str) method;
+                      embed_documents(texts) is used for batches when available)
             chunker: Text chunker (must have split(text: str) method)
         """
         self.vectordb = vectordb
@@ -46,21 +49,36 @@ class LongTermMemory:
         Store information in long-term memory using a pluggable chunking strategy.
         """
         chunks = self.chunker.split(content)
+        if not chunks:
+            return
 
-        for chunk in chunks:
-            embedding = self.embedder.embed(chunk)
+        # One embedding call and one vectordb write for all chunks, instead of one of each per chunk
+        # (embed_documents_np, when the embedder has it, skips the array -> list-of-floats round trip)
+        embed_many = getattr(self.embedder, "embed_documents_np", None) or getattr(
+            self.embedder, "embed_documents", None
+        )
+        if embed_many is not None:
+            embeddings = embed_many(chunks)
+        else:
+            embeddings = [self.embedder.embed(chunk) for chunk in chunks]
 
-            self.vectordb.add(
-                ids=[self._build_id(user_id)],
-                embeddings=[embedding],
-                documents=[chunk],
-                metadatas=[{
+        created_at = datetime.utcnow().isoformat()
+        # Random per-call token: two remember() calls (same or another process) can share a timestamp
+        batch = uuid.uuid4().hex
+        self.vectordb.add(
+            ids=[self._build_id(user_id, i, created_at, batch) for i in range(len(chunks))],
+            embeddings=embeddings,
+            documents=chunks,
+            metadatas=[
+                {
                     "user_id": user_id,
                     "type": memory_type,
                     "importance": importance,
-                    "created_at": datetime.utcnow().isoformat(),
-                }],
-            )
+                    "created_at": created_at,
+                }
+                for _ in chunks
+            ],
+        )
 
     def recall(
         self,
@@ -79,6 +97,46 @@ class LongTermMemory:
             filters={"user_id": user_id},
         )
 
+    def recall_columns(
+        self,
+        query: str,
+        user_id: str,
+        top_k: int = 5,
+    ) -> "SearchResults":
+        """
+        recall() as columns: texts, metadatas and scores (distances, smaller = closer).
+        """
+        embedding = self.embedder.embed(query)
+
+        return self.vectordb.search_columns(
+            embedding=embedding,
+            top_k=top_k,
+            filters={"user_id": user_id},
+        )
+
+    async def arecall(
+        self,
+        query: str,
+        user_id: str,
+        top_k: int = 5,
+    ) -> List[Dict]:
+        """
+        recall() for async handlers. The query goes through the embedder's aembed_query()
+        (concurrent recalls share one batched embedding call) when it has one; the blocking
+        vector search runs in a worker thread.
+        """
+        aembed = getattr(self.embedder, "aembed_query", None)
+        if aembed is None:
+            return await asyncio.to_thread(self.recall, query, user_id, top_k)
+
+        embedding = await aembed(query)
+        return await asyncio.to_thread(
+            self.vectordb.search,
+            embedding=embedding,
+            top_k=top_k,
+            filters={"user_id": user_id},
+        )
+
     def forget_user(self, user_id: str) -> None:
         """
         Delete all memories for a user.
@@ -86,5 +144,6 @@ class LongTermMemory:
         self.vectordb.delete(filters={"user_id": user_id})
 
     @staticmethod
-    def _build_id(user_id: str) -> str:
-        return f"{user_id}-{datetime.utcnow().timestamp()}"
\ No newline at end of file
+    def _build_id(user_id: str, seq: int, ts: str, batch: str) -> str:
+        # One timestamp and batch token per remember() call; seq keeps the IDs of its chunks unique
+        return f"{user_id}-{ts}-{batch}-{seq}"
@@ -0,0 +1,29 @@
+from redis.asyncio import ConnectionPool, Redis
+
+"""
+Shared Redis client for the memory layer.
+
+Build one client with make_redis() and pass it to both RedisMemory and ResponseCache,
+so they share a single connection pool instead of each opening its own TCP connections.
+"""
+
+MAX_CONNECTIONS = 50
+
+
+def make_redis(url: str) -> Redis:
+    """
+    Create a Redis client backed by its own connection pool.
+
+    url: Redis connection URL (e.g., 'redis://localhost:6379/0')
+
+    Responses stay raw bytes (decode_responses=False): RedisMemory and ResponseCache
+    parse them with orjson / json, which read UTF-8 bytes directly.
+    """
+    pool = ConnectionPool.from_url(
+        url,
+        max_connections=MAX_CONNECTIONS,
+        socket_keepalive=True,
+        health_check_interval=30,  # PING idle connections before reuse instead of failing a request
+        decode_responses=False,
+    )
+    return Redis(connection_pool=pool)
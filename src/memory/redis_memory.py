@@ -1,6 +1,8 @@
-import redis.asyncio as redis
-import json 
-from typing import List, Dict
+import orjson
+from typing import List, Dict, Optional
+from redis.asyncio import Redis
+
+from src.memory.redis_client import make_redis
 
 """
 # This file contains implementations of a RedisMemory class for managing short-term memory in chatbot applications.
@@ -8,11 +10,15 @@ This class uses Redis to store and retrieve conversation messages efficiently an
 
 ✅ TTL management (auto-expires after 1 hour - perfect for short-term memory)
 ✅ Uses Redis Lists (rpush/lrange) - perfect for conversation history
-✅ decode_responses=True (cleaner code, no manual decoding)
+✅ orjson on raw bytes (decode_responses=False: no separate UTF-8 decode step)
 ✅ Specific method names (add_message, get_messages) - clear intent
 ✅ Better data structure (Lists vs simple key-value)
 """
 
+# Messages kept per session; older ones are trimmed so a long chat can't grow the list forever
+MAX_MESSAGES = 200
+
+
 class RedisMemory:
     """
     Redis-based short-term memory for chatbot conversations.
@@ -20,14 +26,29 @@ class RedisMemory:
     Uses Redis Lists to store conversation messages with automatic expiration.
     Perfect for storing recent conversation context (last N turns).
     """
-    def __init__(self, url: str, ttl_seconds: int = 3600):
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        ttl_seconds: int = 3600,
+        client: Optional[Redis] = None,
+    ):
         """
         Initialize Redis memory client.
         
-        url: Redis connection URL (e.g., 'redis://localhost:6379/0')
+        url: Redis connection URL (e.g., 'redis://localhost:6379/0'), used when no client is given
         ttl_seconds: Time-to-live in seconds (default: 1 hour)
+        client: shared Redis client from make_redis() (e.g. the one ResponseCache uses);
+                it must keep decode_responses=False
         """
-        self.client = redis.from_url(url, decode_responses=True)
+        if client is None:
+            if url is None:
+                raise ValueError("RedisMemory needs either a url or a client")
+            client = make_redis(url)
+        elif client.connection_pool.connection_kwargs.get("decode_responses"):
+            # lrange would hand back str, and the b",".join() in get_messages fails on str items
+            raise ValueError("RedisMemory needs a client with decode_responses=False (use make_redis())")
+        # Raw bytes: orjson parses UTF-8 bytes directly, so redis-py doesn't need to decode first
+        self.client = client
         self.ttl = ttl_seconds
 
     async def add_message(self, session_id: str, role: str, content: str) -> None:
@@ -37,12 +58,17 @@ class RedisMemory:
             content: Message content
         """
         key = f"chat:{session_id}"
-        message = json.dumps({"role": role, "content": content})
+        message = orjson.dumps({"role": role, "content": content})
         
+        # All three commands go out in one round-trip (transaction=False: no MULTI/EXEC needed)
+        pipe = self.client.pipeline(transaction=False)
         # Use Redis List (rpush) - perfect for conversation history
-        await self.client.rpush(key, message)
+        pipe.rpush(key, message)
+        # Keep only the newest MAX_MESSAGES - bounded memory per session
+        pipe.ltrim(key, -MAX_MESSAGES, -1)
         # Set expiration (TTL) - essential for short-term memory
-        await self.client.expire(key, self.ttl)
+        pipe.expire(key, self.ttl)
+        await pipe.execute()
 
     async def get_messages(self, session_id: str, limit: int = 10) -> List[Dict]:
         """
@@ -56,7 +82,8 @@ class RedisMemory:
         # Get last N messages from Redis List
         messages = await self.client.lrange(key, -limit, -1)
         
-        return [json.loads(m) for m in messages]
+        # Each stored message is a JSON object: join them into one JSON array and parse it in a single call
+        return orjson.loads(b"[" + b",".join(messages) + b"]")
 
     async def clear(self, session_id: str) -> None:
         """
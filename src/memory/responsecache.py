@@ -1,9 +1,22 @@
 import hashlib
 import json 
 from typing import Dict, Optional
+import orjson
 from redis.asyncio import Redis
 
+# Cache keys only need to be unique, not cryptographically strong: BLAKE3 (SIMD) when
+# installed, else stdlib BLAKE2b - both faster than SHA-256. 16-byte digest = 32 hex chars.
+try:
+    from blake3 import blake3 as _blake3
+
+    def _key_digest(data: bytes) -> str:
+        return _blake3(data).hexdigest(16)
+except ImportError:
+    def _key_digest(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 DEFAULT_TTL = 900 # 15 minutes
+MAX_PREFIX_CACHE = 4096  # (user_id, model) key prefixes kept by make_key()
 
 """
 SIMPLE EXPLANATION: What is ResponseCache?
@@ -48,6 +61,8 @@ class ResponseCache:
         """
         self.redis = redis
         self.ttl = ttl
+        # "response:{model}:{user_id}:" per (user_id, model), formatted once and reused by make_key()
+        self._prefix_cache: Dict[tuple, str] = {}
     
     @staticmethod
     def _make_hash(payload: dict) -> str:
@@ -68,12 +83,12 @@ class ResponseCache:
           Question: {"message": "Hello"} → hash: "abc123..." (same question = same hash)
           Question: {"message": "Hi"} → hash: "xyz789..." (different question = different hash)
         """
-        # Convert question to JSON string (sorted so same question = same string)
-        raw = json.dumps(payload, sort_keys=True).encode("utf-8")
+        # Convert question to JSON bytes (sorted so same question = same bytes)
+        raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
         # Create unique fingerprint (hash)
-        return hashlib.sha256(raw).hexdigest()
+        return _key_digest(raw)
 
-    def _build_key(
+    def make_key(
         self,
         user_id: str,
         model: str,
@@ -90,9 +105,16 @@ class ResponseCache:
         Example:
           user_id="user123", model="gpt4", question="Hello"
           → key: "response:gpt4:user123:abc123..."
+
+        On a miss, build the key once and pass it to get_by_key() and then
+        set_by_key(), so the question is serialized and hashed only once.
         """
-        payload_hash = self._make_hash(payload)
-        return f"response:{model}:{user_id}:{payload_hash}"
+        prefix = self._prefix_cache.get((user_id, model))
+        if prefix is None:
+            if len(self._prefix_cache) >= MAX_PREFIX_CACHE:
+                self._prefix_cache.clear()  # bound memory across many users; entries are cheap to rebuild
+            prefix = self._prefix_cache[(user_id, model)] = f"response:{model}:{user_id}:"
+        return prefix + self._make_hash(payload)
 
     async def get(
         self,
@@ -117,7 +139,10 @@ class ResponseCache:
           → Check cache: Found answer "It's sunny" (stored as JSON)
           → Return: {"reply": "It's sunny"} (NOT hashed!)
         """
-        key = self._build_key(user_id, model, payload)
+        return await self.get_by_key(self.make_key(user_id, model, payload))
+
+    async def get_by_key(self, key: str) -> Optional[dict]:
+        """get() for a key already built with make_key()."""
         cached = await self.redis.get(key)
         if cached:
             return json.loads(cached)  # Found it! Return saved answer
@@ -151,12 +176,22 @@ class ResponseCache:
           → Store: Key = JSON string of answer (readable!)
           → Next time same question → instant answer!
         """
-        key = self._build_key(user_id, model, payload)
-        await self.redis.setex(
+        await self.set_by_key(user_id, self.make_key(user_id, model, payload), response)
+
+    async def set_by_key(self, user_id: str, key: str, response: dict) -> None:
+        """set() for a key already built with make_key()."""
+        user_keys = self._user_keys_key(user_id)
+        # One round-trip: store the answer and remember its key in the user's key set
+        # (the set lives as long as the newest answer, so it never outlives what it tracks)
+        pipe = self.redis.pipeline()
+        pipe.setex(
             key,
             self.ttl,  # Expire after 15 minutes
             json.dumps(response)  # Save the answer
         )
+        pipe.sadd(user_keys, key)
+        pipe.expire(user_keys, self.ttl)
+        await pipe.execute()
 
     async def invalidate_user(self, user_id: str) -> None:
         """
@@ -169,10 +204,17 @@ class ResponseCache:
         
         Example:
           User wants to clear their cache
-          → Find all keys like "response:*:user123:*"
-          → Delete them all
+          → Read the user's key set "user_keys:user123"
+          → Delete those keys (and the set) in one command
           → User's cache is cleared
+
+        Uses the per-user key set maintained by set() instead of scanning every key in Redis.
         """
-        pattern = f"response:*:{user_id}:*"  # Find all keys for this user
-        async for key in self.redis.scan_iter(match=pattern):
-            await self.redis.delete(key)  # Delete each one
+        user_keys = self._user_keys_key(user_id)
+        keys = await self.redis.smembers(user_keys)
+        await self.redis.delete(*keys, user_keys)
+
+    @staticmethod
+    def _user_keys_key(user_id: str) -> str:
+        """Redis SET holding all cached answer keys of one user."""
+        return f"user_keys:{user_id}"
@@ -1,6 +1,31 @@
-from typing import List, Dict, Optional
-from chromadb import Client
-from chromadb.config import Settings
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Union
+
+import chromadb
+import numpy as np
+
+# HNSW graph settings, fixed when the collection is created (M / construction_ef)
+# or used as the default at query time (search_ef); see set_ef_search() to change the latter.
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
+
+
+@dataclass(slots=True)
+class SearchResults:
+    """
+    Search hits as columns (one list/array per field, row i = hit i), best match first.
+    scores are Chroma distances: smaller = closer.
+    """
+    texts: List[str]
+    metadatas: List[Dict]
+    scores: np.ndarray  # float32, shape (n_hits,)
+
+    def __len__(self) -> int:
+        return len(self.texts)
 
 
 class VectorDB:
@@ -14,23 +39,34 @@ class VectorDB:
         collection_name: str,
         persist_directory: str = "./chroma",
     ):
-        self.client = Client(
-            Settings(persist_directory=persist_directory)
-        )
+        # PersistentClient keeps the index on disk, so memories (and the built HNSW graph)
+        # survive restarts instead of being re-created in memory by every process
+        self.client = chromadb.PersistentClient(path=persist_directory)
         self.collection = self.client.get_or_create_collection(
-            name=collection_name
+            name=collection_name,
+            metadata=HNSW_METADATA,
         )
 
+    def set_ef_search(self, ef_search: int) -> None:
+        """
+        Change the HNSW search breadth: lower = fewer graph nodes visited (faster, lower recall).
+        Chroma maps the legacy hnsw:* metadata onto the collection configuration, so this
+        updates the stored config (persisted; the hnsw:search_ef metadata entry is left as is).
+        """
+        self.collection.modify(configuration={"hnsw": {"ef_search": ef_search}})
+
     def add(
         self,
         ids: List[str],
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray],
         documents: List[str],
         metadatas: List[Dict],
     ) -> None:
+        # Chroma stores float32 vectors: hand it one contiguous (N, D) float32 array
+        # rather than N lists of Python floats (8-byte objects converted one by one)
         self.collection.add(
             ids=ids,
-            embeddings=embeddings,
+            embeddings=np.asarray(embeddings, dtype=np.float32),
             documents=documents,
             metadatas=metadatas,
         )
@@ -41,11 +77,7 @@ class VectorDB:
         top_k: int = 5,
         filters: Optional[Dict] = None,
     ) -> List[Dict]:
-        results = self.collection.query(
-            query_embeddings=[embedding],
-            n_results=top_k,
-            where=filters,
-        )
+        results = self._query(embedding, top_k, filters)
 
         return [
             {
@@ -60,5 +92,29 @@ class VectorDB:
             )
         ]
 
+    def search_columns(
+        self,
+        embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict] = None,
+    ) -> SearchResults:
+        """
+        search() as columns: Chroma already returns them, so no dict is built per hit.
+        """
+        results = self._query(embedding, top_k, filters)
+
+        return SearchResults(
+            texts=results["documents"][0],
+            metadatas=results["metadatas"][0],
+            scores=np.asarray(results["distances"][0], dtype=np.float32),
+        )
+
+    def _query(self, embedding: List[float], top_k: int, filters: Optional[Dict]) -> Dict:
+        return self.collection.query(
+            query_embeddings=[embedding],
+            n_results=top_k,
+            where=filters,
+        )
+
     def delete(self, filters: Dict) -> None:
         self.collection.delete(where=filters)
\ No newline at end of file
@@ -0,0 +1,91 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+# Go up 3 levels: api -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api import ratelimiter
+from src.api.ratelimiter import TokenBucket
+
+
+class FakeClock:
+    """Stands in for time.monotonic_ns; advance() moves time forward by the given seconds."""
+
+    def __init__(self):
+        self.now_ns = 1_000 * 10**9
+
+    def __call__(self) -> int:
+        return self.now_ns
+
+    def advance(self, seconds: float) -> None:
+        self.now_ns += int(seconds * 10**9)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimiter.time, "monotonic_ns", fake)
+    return fake
+
+
+def test_consume_until_capacity_is_exhausted(clock):
+    bucket = TokenBucket(capacity=3, refill_rate=1.0)
+
+    assert [bucket.consume(1) for _ in range(4)] == [True, True, True, False]
+
+
+def test_partial_refill_after_elapsed_time(clock):
+    bucket = TokenBucket(capacity=10, refill_rate=2.0)
+    assert bucket.consume(10)
+
+    clock.advance(1.5)
+
+    assert bucket.consume(3)
+    assert not bucket.consume(1)
+
+
+def test_refill_is_clamped_to_capacity(clock):
+    bucket = TokenBucket(capacity=5, refill_rate=2.0)
+    assert bucket.consume(2)
+
+    clock.advance(3600)
+
+    assert bucket.consume(0)  # triggers a refill
+    assert bucket.tokens == 5
+    assert bucket.consume(5)
+    assert not bucket.consume(1)
+
+
+def test_fractional_refill_rate_accumulates(clock):
+    bucket = TokenBucket(capacity=1, refill_rate=0.5)
+    assert bucket.consume(1)
+
+    clock.advance(1)
+    assert not bucket.consume(1)
+    assert bucket.tokens == 0.5
+
+    clock.advance(1)
+    assert bucket.consume(1)
+
+
+def test_concurrent_consume_never_over_grants(clock):
+    bucket = TokenBucket(capacity=50, refill_rate=1.0)
+    granted = []
+    start = threading.Barrier(8)
+
+    def worker():
+        start.wait()
+        granted.extend(bucket.consume(1) for _ in range(20))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert granted.count(True) == 50
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root to Python path
+# Go up 3 levels: api -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# The router imports the controller, which imports the RAG pipeline module (needs the full runtime stack)
+for module in ("cachetools", "numpy", "chromadb", "openai", "torch", "transformers"):
+    pytest.importorskip(module)
+
+from src.api.controller import chat_controller
+from src.api.router import router
+from src.database.dto import ChatHistoryResponse
+
+
+@pytest.fixture
+def history(monkeypatch):
+    """Mutable list of messages served by the (patched) controller."""
+    messages = [{"role": "user", "content": "hi"}]
+
+    async def get_chat_history(request):
+        return ChatHistoryResponse(messages=list(messages), total=len(messages), session_id=request.session_id)
+
+    monkeypatch.setattr(chat_controller, "get_chat_history", get_chat_history)
+    return messages
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    return TestClient(app)
+
+
+def test_history_etag_and_conditional_get(client, history):
+    first = client.get("/api/v1/history", params={"user_id": 1})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.json()["messages"] == history
+
+    cached = client.get("/api/v1/history", params={"user_id": 1}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    history.append({"role": "assistant", "content": "hello"})
+    changed = client.get("/api/v1/history", params={"user_id": 1}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["total"] == 2
@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+# Go up 4 levels: chatbot -> business -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# chatbot imports the RAG pipeline module, which needs the full runtime stack
+for module in ("cachetools", "numpy", "chromadb", "openai", "torch", "transformers"):
+    pytest.importorskip(module)
+
+from src.business.chatbot.chatbot import detect_query_type, parse_to_structured
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["Create a task to buy groceries", "create task: call mom", "Create tasks for tomorrow"],
+)
+def test_create_task_commands_are_detected_and_parsed(message):
+    assert detect_query_type(message) == "structured"
+    assert parse_to_structured(message).action == "create_task"
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["create a taskforce for the launch", "recreate task list from backup", "How are you today?"],
+)
+def test_substring_matches_are_freeform(message):
+    assert detect_query_type(message) == "freeform"
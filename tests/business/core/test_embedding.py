@@ -0,0 +1,57 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+# Go up 4 levels: core -> business -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("numpy")
+pytest.importorskip("openai")
+
+from src.business.core.embedding import AsyncBatchedEmbedder, Embedder
+
+
+class RecordingEmbedder(Embedder):
+    """Embeds a text as [len(text)] and records every embed_documents() call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_concurrent_aembed_query_calls_share_one_batch():
+    embedder = RecordingEmbedder()
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    async def run():
+        return await asyncio.gather(*(embedder.aembed_query(text) for text in texts))
+
+    vectors = asyncio.run(run())
+
+    assert embedder.calls == [texts]
+    assert vectors == [[1.0], [2.0], [3.0], [4.0]]
+
+
+def test_batcher_resolves_every_request_under_tiny_timeouts():
+    embedder = RecordingEmbedder()
+    batcher = AsyncBatchedEmbedder(embedder, max_batch=7, max_wait=1e-6)
+    texts = ["x" * (i % 13) for i in range(500)]
+
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(*(batcher.embed(text) for text in texts)), timeout=10)
+
+    vectors = asyncio.run(run())
+
+    assert vectors == [[float(len(text))] for text in texts]
+    assert all(len(call) <= 7 for call in embedder.calls)
+    assert sum(len(call) for call in embedder.calls) == len(texts)
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+# Go up 4 levels: core -> business -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from src.business.core.hf_embedding import LocalHFEmbedder
+
+
+class _CharTokenizer:
+    """One token per character, so token length == text length."""
+
+    def __call__(self, texts, truncation=True, max_length=None):
+        ids = [[ord(c) for c in text][:max_length] for text in texts]
+        return {"input_ids": ids, "attention_mask": [[1] * len(row) for row in ids]}
+
+
+def _embedder(batch_size: int) -> LocalHFEmbedder:
+    embedder = LocalHFEmbedder.__new__(LocalHFEmbedder)
+    embedder.tokenizer = _CharTokenizer()
+    embedder.batch_size = batch_size
+    embedder.max_length = 512
+    embedder.dim = 2
+    batches = embedder.batches = []
+
+    def forward(features):
+        # Row = (token count, first token id): identifies which text it was computed from
+        rows = features["input_ids"]
+        batches.append([len(ids) for ids in rows])
+        return np.array([[len(ids), ids[0]] for ids in rows], dtype=np.float32)
+
+    embedder._forward = forward
+    return embedder
+
+
+def test_encode_batches_by_length_and_returns_input_order():
+    texts = ["ccccc", "a", "dddddddd", "bb", "eee"]
+    embedder = _embedder(batch_size=2)
+
+    embeddings = embedder.embed_documents_np(texts)
+
+    assert embedder.batches == [[1, 2], [3, 5], [8]]
+    assert embeddings.tolist() == [[len(t), ord(t[0])] for t in texts]
+
+
+def test_embed_documents_np_batch_size_override():
+    embedder = _embedder(batch_size=2)
+
+    embedder.embed_documents_np(["a", "bb", "ccc"], batch_size=3)
+
+    assert embedder.batches == [[1, 2, 3]]
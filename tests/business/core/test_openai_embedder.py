@@ -0,0 +1,83 @@
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to Python path
+# Go up 4 levels: core -> business -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("openai")
+
+from src.business.core.embedding import OpenAIEmbedder
+
+
+class StubEmbeddingsAPI:
+    """Fake client.embeddings: embeds a text as [len(text), 1, 0] and records every request."""
+
+    def __init__(self):
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def create(self, model, input):
+        with self._lock:
+            self.requests.append((model, list(input)))
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(t)), 1.0, 0.0]) for t in input])
+
+
+def _embedder(tmp_path, model="text-embedding-3-small", cache=True):
+    embedder = OpenAIEmbedder(api_key="test", model=model, cache_dir=tmp_path if cache else None)
+    api = StubEmbeddingsAPI()
+    embedder.client = SimpleNamespace(embeddings=api)
+    return embedder, api
+
+
+def test_cache_serves_repeated_text_without_an_api_request(tmp_path):
+    embedder, api = _embedder(tmp_path)
+
+    first = embedder.embed_query_np("hello")
+    second = embedder.embed_query_np("hello")
+
+    assert len(api.requests) == 1
+    np.testing.assert_array_equal(first, second)
+    assert second.dtype == np.float32
+    assert np.linalg.norm(second) == pytest.approx(1.0)
+
+
+def test_cache_persists_across_instances_and_is_keyed_by_model(tmp_path):
+    embedder, _ = _embedder(tmp_path)
+    expected = embedder.embed_documents_np(["alpha", "beta"])
+
+    reopened, reopened_api = _embedder(tmp_path)
+    np.testing.assert_array_equal(reopened.embed_documents_np(["beta", "alpha"]), expected[::-1])
+    assert reopened_api.requests == []
+
+    other_model, other_api = _embedder(tmp_path, model="text-embedding-3-large")
+    other_model.embed_query_np("alpha")
+    assert other_api.requests == [("text-embedding-3-large", ["alpha"])]
+
+
+def test_pack_batches_respects_item_and_char_limits_and_order():
+    texts = ["a" * 5, "b" * 5, "c" * 12, "d", "e", "f", "g" * 3]
+
+    batches = OpenAIEmbedder._pack_batches(texts, max_chars=10, max_items=3)
+
+    assert batches == [["a" * 5, "b" * 5], ["c" * 12], ["d", "e", "f"], ["g" * 3]]
+    assert [t for batch in batches for t in batch] == texts
+
+
+def test_parallel_sub_batches_are_reassembled_in_input_order(tmp_path):
+    embedder, api = _embedder(tmp_path, cache=False)
+    texts = [f"text-{'x' * n}" for n in (9, 1, 14, 3, 0, 7, 2, 11)]
+
+    embeddings = embedder._embed(texts, max_chars=30, max_items=2, max_parallel=4)
+
+    assert len(api.requests) > 1
+    assert all(len(batch) <= 2 and sum(map(len, batch)) <= 30 or len(batch) == 1 for _, batch in api.requests)
+    expected = np.array([[len(t), 1.0, 0.0] for t in texts], dtype=np.float32)
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    np.testing.assert_allclose(embeddings, expected, rtol=1e-6)
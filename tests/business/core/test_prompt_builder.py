@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+# Go up 4 levels: core -> business -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.business.core.prompt_builder import PromptBuilder
+
+
+def test_user_message_with_context_has_exact_layout():
+    builder = PromptBuilder(system_prompt="SYS")
+
+    messages = builder.build_messages("What is X?", ["X is a letter.", "Y follows X."])
+
+    assert messages == [
+        {"role": "system", "content": "SYS"},
+        {
+            "role": "user",
+            "content": (
+                "Use the following context to answer the question.\n"
+                "[Context 1]: X is a letter.\n\n"
+                "[Context 2]: Y follows X.\n"
+                "Question: What is X?\n"
+                "Rules:\n"
+                "- Answer based only on the provided context.\n"
+                '- If the answer is not in the context, respond with "I don\'t know."\n'
+                "- Be concise and to the point.\n"
+                "- Do not invent information.\n"
+            ),
+        },
+    ]
+
+
+def test_user_message_without_context_is_the_bare_question():
+    builder = PromptBuilder(system_prompt="SYS")
+
+    assert builder.build_messages("Hello?", []) == [
+        {"role": "system", "content": "SYS"},
+        {"role": "user", "content": "Hello?"},
+    ]
+    assert builder.build_prompt_text("Hello?", []) == "SYS\nHello?"
+
+
+def test_static_prefix_is_byte_identical_and_starts_every_context_prompt():
+    builder = PromptBuilder(system_prompt="SYS")
+
+    prefix = builder.static_prefix_text()
+
+    assert prefix == "SYS\nUse the following context to answer the question.\n"
+    assert builder.static_prefix_text().encode() == prefix.encode()
+    assert PromptBuilder(system_prompt="SYS").static_prefix_text() == prefix
+    assert builder.build_prompt_text("Q?", ["ctx"]).startswith(prefix)
+    assert builder.build_prompt_text("Q?", ["ctx"]) == (prefix + builder.context_and_question("Q?", ["ctx"])).strip()
@@ -18,13 +18,8 @@ class MockScorer(ReRankScorer):
         query: str,
         chunks: List[RetrievedChunk],
     ) -> List[ReRankedChunk]:
+        # Positional construction: no keyword-argument matching per chunk
         return [
-            ReRankedChunk(
-                chunk_id=chunk.chunk_id,
-                text=chunk.text,
-                metadata=chunk.metadata,
-                vector_score=chunk.vector_score,
-                rerank_score=i * 0.1,  # deterministic score
-            )
+            ReRankedChunk(chunk.chunk_id, chunk.text, chunk.metadata, chunk.vector_score, i * 0.1)  # deterministic score
             for i, chunk in enumerate(chunks)
         ]
@@ -0,0 +1,107 @@
+# tests/business/rag/re_ranker/test_cross_encoder.py
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+# Go up 5 levels: re_ranker -> rag -> business -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from src.business.rag.re_ranker import cross_encoder
+from src.business.rag.re_ranker.config import ReRankerConfig
+from src.business.rag.re_ranker.cross_encoder import CrossEncoderReRanker
+
+
+class _FakeTokenizer:
+    is_fast = True
+    model_max_length = 512
+
+
+class _FakeModel:
+    def to(self, device):
+        return self
+
+    def eval(self):
+        return self
+
+
+def test_cpu_load_skips_torch_compile(monkeypatch):
+    compiled = []
+    monkeypatch.setattr(cross_encoder.AutoTokenizer, "from_pretrained", lambda *a, **kw: _FakeTokenizer())
+    monkeypatch.setattr(
+        cross_encoder.AutoModelForSequenceClassification, "from_pretrained", lambda *a, **kw: _FakeModel()
+    )
+    monkeypatch.setattr(torch, "compile", lambda model, **kw: compiled.append(model) or model)
+
+    scorer = CrossEncoderReRanker(ReRankerConfig(device="cpu", compile_model=True))
+    scorer._ensure_loaded()
+
+    assert compiled == []
+    assert isinstance(scorer.model, _FakeModel)
+
+
+def test_encode_pairs_matches_tokenizer_pair_encoding():
+    config = ReRankerConfig()
+    try:
+        tokenizer = cross_encoder.AutoTokenizer.from_pretrained(config.model_name, use_fast=True)
+    except OSError:
+        pytest.skip(f"tokenizer for {config.model_name} not available offline")
+    scorer = CrossEncoderReRanker(config)
+    scorer.tokenizer = tokenizer
+
+    query = "How do I reset my password?"
+    texts = ["Open Settings, then Security, then Reset password.", "Unrelated text about the weather."]
+    encoded = scorer._encode_pairs(query, texts)
+
+    for i, text in enumerate(texts):
+        expected = tokenizer(query, text, truncation=True, max_length=config.max_length)
+        for key, ids in encoded.items():
+            assert ids[i] == expected[key]
+
+
+def test_full_pair_fallback_truncates_query_longer_than_max_length(tmp_path):
+    from transformers import BertTokenizerFast
+
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "password", "reset", "settings"]))
+    config = ReRankerConfig(max_length=32)
+    scorer = CrossEncoderReRanker(config)
+    scorer.tokenizer = BertTokenizerFast(vocab_file=str(vocab))
+    scorer._manual_pairs = False  # force the tokenizer(query, text) path
+
+    encoded = scorer._encode_pairs("reset password " * 50, ["open settings", "reset"])
+
+    assert all(len(ids) <= config.max_length for ids in encoded["input_ids"])
+    assert all(ids[-1] == scorer.tokenizer.sep_token_id for ids in encoded["input_ids"])
+
+
+def _chunk(chunk_id: str, text: str):
+    from src.business.rag.re_ranker.interface import RetrievedChunk
+
+    return RetrievedChunk(chunk_id=chunk_id, text=text, metadata={}, vector_score=0.0)
+
+
+def test_score_cache_only_scores_misses_per_query():
+    scorer = CrossEncoderReRanker(ReRankerConfig(score_cache_size=16))
+    scored = []
+
+    def batch_score(query, texts):
+        scored.append((query, list(texts)))
+        return [float(len(query) + len(text)) for text in texts]
+
+    scorer._batch_score = batch_score
+
+    first = scorer.score("q", [_chunk("1", "aa"), _chunk("2", "bbb")])
+    second = scorer.score("q", [_chunk("2", "bbb"), _chunk("1", "aa"), _chunk("3", "c")])
+    other = scorer.score("other", [_chunk("1", "aa")])
+
+    assert scored == [("q", ["aa", "bbb"]), ("q", ["c"]), ("other", ["aa"])]
+    assert [c.rerank_score for c in first] == [3.0, 4.0]
+    assert [c.rerank_score for c in second] == [4.0, 3.0, 2.0]
+    assert [c.rerank_score for c in other] == [7.0]
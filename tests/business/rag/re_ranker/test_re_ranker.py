@@ -60,3 +60,16 @@ def test_empty_input_returns_empty():
     reranker = ReRanker(scorer=MockScorer(), config=config)
 
     assert reranker.re_rank("query", []) == []
+
+
+def test_few_candidates_skip_scorer_when_enabled():
+    class FailingScorer(MockScorer):
+        def score(self, query, chunks):
+            raise AssertionError("scorer should not be called")
+
+    config = ReRankerConfig(top_n_output=8, skip_when_few_candidates=True)
+    reranker = ReRanker(scorer=FailingScorer(), config=config)
+
+    result = reranker.re_rank("query", _make_chunks(3))
+
+    assert [c.chunk_id for c in result] == ["0", "1", "2"]
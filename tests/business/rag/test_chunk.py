@@ -0,0 +1,58 @@
+import hashlib
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+# Go up 4 levels: rag -> business -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.business.rag.pdfingest.chunk import _CHUNK_ID_HASHERS, Chunker
+
+
+def test_split_covers_text_with_overlap_and_terminates():
+    chunker = Chunker(chunk_size=10, overlap=3)
+    text = "abcdefghijklmnopqrstuvwxyz"
+
+    chunks = chunker.split(text, source_metadata={"source_id": "doc.pdf"})
+
+    starts = [c.metadata["chunk_start"] for c in chunks]
+    assert starts == [0, 7, 14, 21]
+    assert chunks[-1].metadata["chunk_end"] == len(text)
+    assert all(c.metadata["source_id"] == "doc.pdf" for c in chunks)
+
+
+def test_split_strips_edge_whitespace():
+    chunker = Chunker(chunk_size=10, overlap=2)
+
+    chunks = chunker.split("  hello   ", source_metadata={})
+
+    assert [c.text for c in chunks] == ["hello"]
+
+
+def test_split_empty_text_returns_empty():
+    assert Chunker().split("   ", source_metadata={}) == []
+
+
+def test_chunk_id_matches_sha1_of_source_start_and_text_prefix():
+    chunker = Chunker(chunk_size=10, overlap=3)
+
+    chunks = chunker.split("abcdefghijklmnopqrstuvwxyz", source_metadata={"source_id": "doc.pdf"})
+
+    expected = hashlib.sha1(("doc.pdf" + "7" + chunks[1].text[:100]).encode("utf-8")).hexdigest()
+    assert chunks[1].chunk_id == expected
+
+
+@pytest.mark.parametrize("hash_algo", sorted(_CHUNK_ID_HASHERS))
+def test_chunk_ids_are_deterministic_for_every_hash_algo(hash_algo):
+    text = "abcdefghijklmnopqrstuvwxyz"
+
+    first = Chunker(chunk_size=10, overlap=3, hash_algo=hash_algo).split(text, source_metadata={"source_id": "doc.pdf"})
+    second = Chunker(chunk_size=10, overlap=3, hash_algo=hash_algo).split(text, source_metadata={"source_id": "doc.pdf"})
+
+    ids = [c.chunk_id for c in first]
+    assert ids == [c.chunk_id for c in second]
+    assert len(set(ids)) == len(ids)
+    assert {len(chunk_id) for chunk_id in ids} == {32 if hash_algo == "xxh128" else 40}
@@ -9,7 +9,7 @@ At this point, the reranker has been tested to ensure it behaves correctly under
     Separated policy from ML
     Made behavior testable and explicit
 """
-from src.business.rag.orchestrator import select_context
+from src.business.rag.re_ranker.orchestrator import select_context
 from src.business.rag.re_ranker.config import ReRankerConfig
 from src.business.rag.re_ranker.re_ranker import ReRanker
 from src.business.rag.re_ranker.interface import RetrievedChunk, ReRankedChunk, ReRankScorer
@@ -66,4 +66,26 @@ def test_fail_open_policy():
     )
 
     assert len(result) == 2
-    assert confidence == "low"
\ No newline at end of file
+    assert confidence == "low"
+
+def test_fallback_keeps_closest_chunks_by_vector_distance():
+    reranker = ReRanker(
+        scorer=EmptyScorer(),
+        config=ReRankerConfig(top_n_output=3)
+    )
+
+    # vector_score is a distance: smaller = closer; ties keep retrieval order
+    distances = [0.9, 0.2, 0.5, 0.2, 0.7]
+    chunks = [
+        RetrievedChunk(chunk_id=str(i), text=f"text {i}", metadata={}, vector_score=d)
+        for i, d in enumerate(distances)
+    ]
+    result, confidence = select_context(
+        query="test",
+        retrieved_chunks=chunks,
+        reranker=reranker,
+        policy="hybrid"
+    )
+
+    assert [c.chunk_id for c in result] == ["1", "3", "2"]
+    assert confidence == "low"
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root to Python path
+# Go up 3 levels: database -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.dto import ChatMessageRequest
+
+app = FastAPI()
+
+
+@app.post("/echo")
+async def echo(request: ChatMessageRequest):
+    return {"message": request.message}
+
+
+client = TestClient(app)
+
+
+def test_whitespace_only_message_is_rejected_with_422():
+    response = client.post("/echo", json={"message": "   "})
+
+    assert response.status_code == 422
+
+
+def test_message_is_stripped():
+    response = client.post("/echo", json={"message": "  hi  "})
+
+    assert response.status_code == 200
+    assert response.json() == {"message": "hi"}
@@ -0,0 +1,95 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+# Go up 3 levels: memory -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("chromadb")
+
+from src.memory.long_term_memory import LongTermMemory
+from src.memory.vectordb import SearchResults, VectorDB
+
+
+class KeywordEmbedder:
+    """Embeds a text as [count("apple"), count("pear"), 1]: texts about the same fruit end up close."""
+
+    def embed(self, text):
+        return [float(text.count("apple")), float(text.count("pear")), 1.0]
+
+    def embed_documents(self, texts):
+        return [self.embed(text) for text in texts]
+
+
+class LineChunker:
+    def split(self, text):
+        return [line for line in text.splitlines() if line.strip()]
+
+
+@pytest.fixture
+def memory(tmp_path):
+    vectordb = VectorDB("test_memories", persist_directory=str(tmp_path))
+    memory = LongTermMemory(vectordb, KeywordEmbedder(), LineChunker())
+    memory.remember("apple apple pie\npear tart", user_id="u1")
+    memory.remember("apple juice", user_id="u2")
+    return memory
+
+
+def test_recall_returns_one_dict_per_hit(memory):
+    hits = memory.recall("apple", user_id="u1", top_k=2)
+
+    assert isinstance(hits, list)
+    assert [hit["text"] for hit in hits] == ["apple apple pie", "pear tart"]
+    assert all(set(hit) == {"text", "metadata", "score"} for hit in hits)
+    assert all(hit["metadata"]["user_id"] == "u1" for hit in hits)
+    assert hits[0]["score"] <= hits[1]["score"]
+
+
+def test_recall_columns_matches_recall(memory):
+    hits = memory.recall("apple", user_id="u1", top_k=2)
+    columns = memory.recall_columns("apple", user_id="u1", top_k=2)
+
+    assert isinstance(columns, SearchResults)
+    assert len(columns) == 2
+    assert columns.texts == [hit["text"] for hit in hits]
+    assert columns.metadatas == [hit["metadata"] for hit in hits]
+    assert columns.scores.dtype == np.float32
+    np.testing.assert_allclose(columns.scores, [hit["score"] for hit in hits], rtol=1e-6)
+
+
+class FrozenDatetime:
+    @staticmethod
+    def utcnow():
+        return datetime(2024, 1, 1, 12, 0, 0)
+
+
+class RecordingVectorDB:
+    def __init__(self):
+        self.ids = []
+
+    def add(self, ids, embeddings, documents, metadatas):
+        self.ids.extend(ids)
+
+
+def test_ids_unique_within_and_across_instances_in_same_tick(monkeypatch):
+    import src.memory.long_term_memory as long_term_memory
+
+    # Every remember() call sees the same timestamp
+    monkeypatch.setattr(long_term_memory, "datetime", FrozenDatetime)
+    vectordb = RecordingVectorDB()
+    first = LongTermMemory(vectordb, KeywordEmbedder(), LineChunker())
+    second = LongTermMemory(vectordb, KeywordEmbedder(), LineChunker())
+
+    batch = "\n".join(f"apple {i}" for i in range(50))
+    first.remember(batch, user_id="u1")
+    first.remember(batch, user_id="u1")
+    second.remember(batch, user_id="u1")
+
+    assert len(vectordb.ids) == 150
+    assert len(set(vectordb.ids)) == 150
+    assert all(id_.startswith("u1-2024-01-01T12:00:00-") for id_ in vectordb.ids)
@@ -0,0 +1,69 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+# Go up 3 levels: memory -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("orjson")
+
+from src.memory.redis_memory import MAX_MESSAGES, RedisMemory
+
+
+@pytest.fixture
+def memory():
+    return RedisMemory(ttl_seconds=60, client=fakeredis.FakeAsyncRedis())
+
+
+def test_messages_come_back_in_order(memory):
+    async def run():
+        await memory.add_message("s1", "user", "hi")
+        await memory.add_message("s1", "assistant", "héllo")
+        await memory.add_message("s1", "user", "how are you?")
+        return await memory.get_messages("s1", limit=10), await memory.get_messages("s1", limit=2)
+
+    everything, last_two = asyncio.run(run())
+    assert everything == [
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "héllo"},
+        {"role": "user", "content": "how are you?"},
+    ]
+    assert last_two == everything[1:]
+
+
+def test_empty_session_returns_no_messages(memory):
+    assert asyncio.run(memory.get_messages("missing")) == []
+
+
+def test_list_is_trimmed_to_max_messages(memory):
+    async def run():
+        for i in range(MAX_MESSAGES + 5):
+            await memory.add_message("s1", "user", str(i))
+        return (
+            await memory.client.llen("chat:s1"),
+            await memory.get_messages("s1", limit=MAX_MESSAGES + 5),
+        )
+
+    length, messages = asyncio.run(run())
+    assert length == MAX_MESSAGES
+    # The oldest five were dropped, the newest is last
+    assert messages[0]["content"] == "5"
+    assert messages[-1]["content"] == str(MAX_MESSAGES + 4)
+
+
+def test_ttl_is_set_on_every_add(memory):
+    async def run():
+        await memory.add_message("s1", "user", "hi")
+        return await memory.client.ttl("chat:s1")
+
+    assert 0 < asyncio.run(run()) <= 60
+
+
+def test_rejects_client_that_decodes_responses():
+    with pytest.raises(ValueError, match="decode_responses"):
+        RedisMemory(client=fakeredis.FakeAsyncRedis(decode_responses=True))
@@ -0,0 +1,74 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+# Go up 3 levels: memory -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("orjson")
+
+from src.memory.responsecache import ResponseCache
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(fakeredis.FakeAsyncRedis())
+
+
+def test_same_user_prompt_and_params_give_same_key(cache):
+    payload = {"message": "What's 2+2?", "temperature": 0.2, "top_p": 0.9}
+
+    key = cache.make_key("user1", "gpt", payload)
+
+    assert key == cache.make_key("user1", "gpt", dict(payload))
+    assert key.startswith("response:gpt:user1:")
+    assert key != cache.make_key("user2", "gpt", payload)
+    assert key != cache.make_key("user1", "gpt", {**payload, "message": "What's 3+3?"})
+
+
+def test_param_order_does_not_change_key(cache):
+    a = {"message": "hi", "params": {"temperature": 0.2, "max_tokens": 64}}
+    b = {"params": {"max_tokens": 64, "temperature": 0.2}, "message": "hi"}
+
+    assert cache.make_key("user1", "gpt", a) == cache.make_key("user1", "gpt", b)
+
+
+def test_set_then_get_roundtrip(cache):
+    async def run():
+        payload = {"message": "hello"}
+        assert await cache.get("user1", "gpt", payload) is None
+        await cache.set("user1", "gpt", payload, {"reply": "hi there"})
+        return await cache.get("user1", "gpt", payload)
+
+    assert asyncio.run(run()) == {"reply": "hi there"}
+
+
+def test_invalidate_user_only_deletes_that_users_keys(cache):
+    async def run():
+        for i in range(3):
+            await cache.set("user1", "gpt", {"message": f"q{i}"}, {"reply": f"a{i}"})
+        await cache.set("user2", "gpt", {"message": "q0"}, {"reply": "other"})
+        user1_keys = await cache.redis.smembers(cache._user_keys_key("user1"))
+
+        await cache.invalidate_user("user1")
+
+        remaining = [await cache.redis.exists(key) for key in user1_keys]
+        return (
+            len(user1_keys),
+            remaining,
+            await cache.redis.exists(cache._user_keys_key("user1")),
+            await cache.get("user2", "gpt", {"message": "q0"}),
+            await cache.redis.scard(cache._user_keys_key("user2")),
+        )
+
+    n_keys, remaining, set_exists, other, other_count = asyncio.run(run())
+    assert n_keys == 3
+    assert remaining == [0, 0, 0]
+    assert set_exists == 0
+    assert other == {"reply": "other"}
+    assert other_count == 1
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+# Go up 3 levels: memory -> tests -> project_root
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("numpy")
+pytest.importorskip("chromadb")
+
+from src.memory.vectordb import HNSW_METADATA, VectorDB
+
+
+def _ef_search(vectordb):
+    # Read back through a fresh handle, not the cached collection object
+    return vectordb.client.get_collection(vectordb.collection.name).configuration["hnsw"]["ef_search"]
+
+
+def test_collection_starts_with_metadata_ef_search(tmp_path):
+    vectordb = VectorDB("test_vectors", persist_directory=str(tmp_path))
+
+    assert _ef_search(vectordb) == HNSW_METADATA["hnsw:search_ef"]
+
+
+def test_set_ef_search_takes_effect_and_persists(tmp_path):
+    vectordb = VectorDB("test_vectors", persist_directory=str(tmp_path))
+    vectordb.add(
+        ids=["a", "b"],
+        embeddings=[[1.0, 0.0], [0.0, 1.0]],
+        documents=["first", "second"],
+        metadatas=[{"user_id": "u1"}, {"user_id": "u1"}],
+    )
+
+    vectordb.set_ef_search(16)
+
+    assert _ef_search(vectordb) == 16
+    # Reopening (get_or_create_collection with the legacy metadata again) keeps the new value
+    reopened = VectorDB("test_vectors", persist_directory=str(tmp_path))
+    assert _ef_search(reopened) == 16
+    assert [hit["text"] for hit in reopened.search([1.0, 0.1], top_k=1)] == ["first"]